@@ -0,0 +1,66 @@
+"""create summary_job table
+
+Revision ID: 3f1c2a7d9b40
+Revises: 88b31c649213
+Create Date: 2026-10-18 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a7d9b40'
+down_revision: Union[str, None] = '88b31c649213'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'summary_job',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            'summary_id',
+            sa.Integer(),
+            sa.ForeignKey('text_summary.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column(
+            'run_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        'ix_summary_job_status_run_at', 'summary_job', ['status', 'run_at']
+    )
+    op.create_index('ix_summary_job_summary_id', 'summary_job', ['summary_id'])
+
+    # Re-queue summaries that were lost with the old in-process background tasks
+    op.execute(
+        "INSERT INTO summary_job (summary_id, url, status, attempts) "
+        "SELECT id, url, 'pending', 0 FROM text_summary WHERE summary = ''"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_summary_job_summary_id', table_name='summary_job')
+    op.drop_index('ix_summary_job_status_run_at', table_name='summary_job')
+    op.drop_table('summary_job')
@@ -0,0 +1,35 @@
+"""add updated_at to text_summary
+
+Revision ID: 5b9e81f3c6d2
+Revises: a7e4d0c5f812
+Create Date: 2026-10-18 13:41:52.027316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e81f3c6d2'
+down_revision: Union[str, None] = 'a7e4d0c5f812'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'text_summary', sa.Column('updated_at', sa.DateTime(), nullable=True)
+    )
+    op.execute(
+        "UPDATE text_summary "
+        "SET updated_at = COALESCE(summarized_at, created_at, now() at time zone 'utc')"
+    )
+    op.alter_column('text_summary', 'updated_at', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('text_summary', 'updated_at')
@@ -0,0 +1,120 @@
+"""add normalized_url to text_summary
+
+Revision ID: a7e4d0c5f812
+Revises: 3f1c2a7d9b40
+Create Date: 2026-10-18 11:03:17.604419
+
+"""
+from typing import Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e4d0c5f812'
+down_revision: Union[str, None] = '3f1c2a7d9b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# app.urls.normalize_url as of this revision, frozen so later changes to it
+# don't change what this migration writes.
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "yclid",
+    "_ga",
+    "_hsenc",
+    "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").rstrip(".")
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (
+            name.lower() in TRACKING_PARAMS
+            or name.lower().startswith(TRACKING_PREFIXES)
+        )
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'text_summary', sa.Column('normalized_url', sa.String(), nullable=True)
+    )
+    op.add_column(
+        'text_summary', sa.Column('summarized_at', sa.DateTime(), nullable=True)
+    )
+
+    # Backfill in batches of BATCH_SIZE rows, so the table is never held in
+    # memory at once.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, url FROM text_summary WHERE id > :last_id "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text(
+                "UPDATE text_summary SET normalized_url = :normalized_url "
+                "WHERE id = :id"
+            ),
+            [{"id": id, "normalized_url": normalize_url(url)} for id, url in rows],
+        )
+        last_id = rows[-1].id
+
+    # The oldest row for each normalized URL owns it, later duplicates are
+    # reset to NULL so the unique index can be created.
+    op.execute(
+        "UPDATE text_summary AS duplicate SET normalized_url = NULL "
+        "FROM text_summary AS original "
+        "WHERE original.normalized_url = duplicate.normalized_url "
+        "AND original.id < duplicate.id"
+    )
+    op.execute(
+        "UPDATE text_summary SET summarized_at = created_at WHERE summary != ''"
+    )
+
+    op.create_index(
+        'ix_text_summary_normalized_url',
+        'text_summary',
+        ['normalized_url'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_text_summary_normalized_url', table_name='text_summary')
+    op.drop_column('text_summary', 'summarized_at')
+    op.drop_column('text_summary', 'normalized_url')
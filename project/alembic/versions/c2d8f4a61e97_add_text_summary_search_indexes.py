@@ -0,0 +1,63 @@
+"""add text_summary filter and search indexes
+
+Revision ID: c2d8f4a61e97
+Revises: 5b9e81f3c6d2
+Create Date: 2026-10-18 15:02:37.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8f4a61e97'
+down_revision: Union[str, None] = '5b9e81f3c6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'text_summary',
+        sa.Column(
+            'domain',
+            sa.String(),
+            sa.Computed("substring(normalized_url from '^[a-z]+://([^/:?#]+)')"),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_text_summary_domain', 'text_summary', ['domain'])
+    op.create_index(
+        'ix_text_summary_created_at_id', 'text_summary', ['created_at', 'id']
+    )
+    op.create_index(
+        'ix_text_summary_url_pattern',
+        'text_summary',
+        ['url'],
+        postgresql_ops={'url': 'text_pattern_ops'},
+    )
+    op.create_index(
+        'ix_text_summary_pending',
+        'text_summary',
+        ['id'],
+        postgresql_where=sa.text("summary = ''"),
+    )
+    op.create_index(
+        'ix_text_summary_summary_search',
+        'text_summary',
+        [sa.text("to_tsvector('english'::regconfig, summary)")],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_text_summary_summary_search', table_name='text_summary')
+    op.drop_index('ix_text_summary_pending', table_name='text_summary')
+    op.drop_index('ix_text_summary_url_pattern', table_name='text_summary')
+    op.drop_index('ix_text_summary_created_at_id', table_name='text_summary')
+    op.drop_index('ix_text_summary_domain', table_name='text_summary')
+    op.drop_column('text_summary', 'domain')
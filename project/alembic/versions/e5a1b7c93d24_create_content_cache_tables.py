@@ -0,0 +1,77 @@
+"""create content cache tables
+
+Revision ID: e5a1b7c93d24
+Revises: c2d8f4a61e97
+Create Date: 2026-10-18 16:48:09.552183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1b7c93d24'
+down_revision: Union[str, None] = 'c2d8f4a61e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'fetched_page',
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=True),
+        sa.Column('last_modified', sa.String(), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('html', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column(
+            'fetched_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'accessed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('url'),
+    )
+    op.create_index(
+        op.f('ix_fetched_page_accessed_at'), 'fetched_page', ['accessed_at']
+    )
+    op.create_table(
+        'content_summary',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('summary', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'accessed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('content_hash'),
+    )
+    op.create_index(
+        op.f('ix_content_summary_accessed_at'), 'content_summary', ['accessed_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_content_summary_accessed_at'), table_name='content_summary')
+    op.drop_table('content_summary')
+    op.drop_index(op.f('ix_fetched_page_accessed_at'), table_name='fetched_page')
+    op.drop_table('fetched_page')
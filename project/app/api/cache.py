@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.cache import summary_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def cache_stats():
+    return summary_cache.stats()
@@ -0,0 +1,81 @@
+"""
+Helpers for HTTP conditional requests (RFC 9110, section 13).
+
+Validators are derived from `text_summary.updated_at`, so they can be
+computed without loading the summary text.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+
+def summary_etag(id: int, updated_at: datetime) -> str:
+    return f'"{id}-{int(updated_at.timestamp() * 1_000_000)}"'
+
+
+def collection_validators(
+    versions: Iterable[Tuple[int, datetime]], variant: str = ""
+) -> Tuple[str, Optional[datetime]]:
+    """
+    ETag and Last-Modified for a page of `(id, updated_at)` pairs. `variant`
+    tells apart representations of the same rows, e.g. different projections.
+    """
+    digest = hashlib.sha1(variant.encode())
+    newest = None
+    for id, updated_at in versions:
+        digest.update(f"{id}:{updated_at.isoformat()};".encode())
+        if newest is None or updated_at > newest:
+            newest = updated_at
+    modified = last_modified(newest) if newest is not None else None
+    return f'"{digest.hexdigest()}"', modified
+
+
+def last_modified(updated_at: datetime) -> datetime:
+    # updated_at is naive UTC; HTTP dates have a one second resolution
+    return updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified(
+    request: Request, etag: str, modified: Optional[datetime] = None
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, and If-Modified-Since is ignored when present
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified <= since
+
+    return False
+
+
+def set_validators(
+    response: Response, etag: str, modified: Optional[datetime] = None
+) -> None:
+    response.headers["ETag"] = etag
+    if modified is not None:
+        response.headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+
+
+def not_modified_response(etag: str, modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, modified)
+    return response
@@ -1,21 +1,147 @@
-from typing import List, Optional, Union
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import DateTime, case, func, literal, select, tuple_, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.pydantic import SummaryPayloadSchema, SummaryUpdatePayloadSchema
-from app.models.sqlalchemy import TextSummary
+from app import jobs
+from app.cache import summary_cache, summary_key
+from app.db import is_replica
+from app.models.pydantic import (
+    SummaryFilterSchema,
+    SummaryPayloadSchema,
+    SummaryRecordSchema,
+    SummaryResponseSchema,
+    SummaryUpdatePayloadSchema,
+)
+from app.models.sqlalchemy import SEARCH_CONFIG, TextSummary, summary_search_vector
+from app.notifications import summary_updated_notification
+from app.urls import normalize_url
 
 
-async def post(payload: SummaryPayloadSchema, db: AsyncSession) -> int:
-    summary = TextSummary(
-        url=str(payload.url),
-        summary="",
-    )
-    db.add(summary)
+async def post(
+    payload: SummaryPayloadSchema,
+    db: AsyncSession,
+    refresh: bool = False,
+    ttl: Optional[int] = None,
+) -> int:
+    [summary_id] = await post_bulk([payload], db, refresh=refresh, ttl=ttl)
+    return summary_id
+
+
+async def post_bulk(
+    payloads: List[SummaryPayloadSchema],
+    db: AsyncSession,
+    batch_size: int = 1000,
+    refresh: bool = False,
+    ttl: Optional[int] = None,
+) -> List[int]:
+    """
+    Insert many summaries at once, returning their ids in payload order.
+
+    URLs are deduplicated on their normalized form: a URL that was already
+    submitted keeps its existing row and is only summarized again when
+    `refresh` is set or its summary is older than `ttl` seconds.
+    """
+    urls = {}  # normalized url -> submitted url, first submission wins
+    for payload in payloads:
+        urls.setdefault(normalize_url(str(payload.url)), str(payload.url))
+    created_at = datetime.utcnow()
+
+    ids = {}
+    normalized = list(urls)
+    for start in range(0, len(normalized), batch_size):
+        # The INSERT and the job for each new row go out as one statement
+        inserted = (
+            pg_insert(TextSummary)
+            .values(
+                [
+                    {
+                        "url": urls[normalized_url],
+                        "normalized_url": normalized_url,
+                        "summary": "",
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    }
+                    for normalized_url in normalized[start : start + batch_size]
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[TextSummary.normalized_url])
+            .returning(TextSummary.id, TextSummary.url, TextSummary.normalized_url)
+            .cte("inserted")
+        )
+        result = await db.execute(
+            select(inserted.c.id, inserted.c.normalized_url).add_cte(
+                jobs.enqueue_from(inserted)
+            )
+        )
+        for summary_id, normalized_url in result.all():
+            ids[normalized_url] = summary_id
+
+    existing = [
+        normalized_url for normalized_url in normalized if normalized_url not in ids
+    ]
+    to_summarize = []
+    stale_before = datetime.utcnow() - timedelta(seconds=ttl) if ttl else None
+    for start in range(0, len(existing), batch_size):
+        result = await db.execute(
+            select(
+                TextSummary.id, TextSummary.normalized_url, TextSummary.summarized_at
+            ).where(
+                TextSummary.normalized_url.in_(existing[start : start + batch_size])
+            )
+        )
+        for summary_id, normalized_url, summarized_at in result.all():
+            ids[normalized_url] = summary_id
+            stale = (
+                stale_before is not None
+                and summarized_at is not None
+                and summarized_at < stale_before
+            )
+            if refresh or stale:
+                to_summarize.append((summary_id, urls[normalized_url]))
+
+    if to_summarize:
+        await jobs.enqueue_many(to_summarize, db, batch_size=batch_size)
     await db.commit()
-    await db.refresh(summary)  # To get the generated ID and other defaults
-    return summary.id
+
+    return [ids[normalize_url(str(payload.url))] for payload in payloads]
+
+
+# Columns of the read fast path: rows come back as plain dicts instead of
+# hydrated TextSummary instances (no identity map or attribute instrumentation).
+SUMMARY_COLUMNS = (
+    TextSummary.id,
+    TextSummary.url,
+    TextSummary.summary,
+    TextSummary.created_at,
+    TextSummary.updated_at,
+)
+
+# Selectable listing fields. A summary is pending until its text is written;
+# comparing against '' only checks the length, not the (possibly toasted) text.
+LIST_COLUMNS = {
+    "id": TextSummary.id,
+    "url": TextSummary.url,
+    "summary": TextSummary.summary,
+    "created_at": TextSummary.created_at,
+    "updated_at": TextSummary.updated_at,
+    "status": case((TextSummary.summary == "", "pending"), else_="complete").label(
+        "status"
+    ),
+}
+DEFAULT_LIST_FIELDS = ("id", "url", "created_at", "status")
+
+
+def _list_columns(fields: Optional[Iterable[str]]):
+    if fields is None:
+        return SUMMARY_COLUMNS
+    # id and updated_at are always needed for pagination and validators
+    names = dict.fromkeys(("id", "updated_at", *fields))
+    return [LIST_COLUMNS[name] for name in names]
 
 
 async def get(id: int, db: AsyncSession) -> Union[TextSummary, None]:
@@ -24,32 +150,228 @@ async def get(id: int, db: AsyncSession) -> Union[TextSummary, None]:
     return summary
 
 
-async def get_all(db: AsyncSession) -> List[TextSummary]:
-    result = await db.execute(select(TextSummary))
+async def get_row(id: int, db: AsyncSession) -> Union[dict, None]:
+    result = await db.execute(select(*SUMMARY_COLUMNS).where(TextSummary.id == id))
+    row = result.first()
+    return None if row is None else row._asdict()
+
+
+async def get_cached(id: int, db: AsyncSession) -> Union[SummaryRecordSchema, None]:
+    """
+    Read-through cache around `get`. Only completed summaries are cached:
+    pending ones are still being written by the worker. Replica reads are
+    not cached either: a lagging replica could put back a row the primary
+    just changed and the cache just forgot.
+    """
+    cached = await summary_cache.get(summary_key(id))
+    if cached is not None:
+        return SummaryRecordSchema.model_validate(cached)
+
+    row = await get_row(id, db)
+    if not row:
+        return None
+
+    record = SummaryRecordSchema.model_validate(row)
+    if record.summary and not is_replica(db):
+        await summary_cache.set(summary_key(id), record.model_dump(mode="json"))
+    return record
+
+
+async def peek_cached(id: int) -> Union[SummaryRecordSchema, None]:
+    """Cached record without counting a hit or miss, or None."""
+    cached = await summary_cache.peek(summary_key(id))
+    return None if cached is None else SummaryRecordSchema.model_validate(cached)
+
+
+async def get_version(id: int, db: AsyncSession) -> Union[datetime, None]:
+    """`updated_at` of a summary without loading its text, None if missing."""
+    result = await db.execute(
+        select(TextSummary.updated_at).where(TextSummary.id == id)
+    )
+    return result.scalar()
+
+
+SORT_COLUMNS = {"id": TextSummary.id, "created_at": TextSummary.created_at}
+
+
+def _all_query(after: Optional[int], filters: Optional[SummaryFilterSchema] = None):
+    """
+    Listing query. Pagination is keyset based: `after` is the id of the last
+    row of the previous page, whatever the sort order, so no OFFSET scans.
+    The row may have been deleted since, see `_cursor`. Every filter and
+    sort order is backed by an index on text_summary.
+    """
+    filters = filters or SummaryFilterSchema()
+    query = select(TextSummary)
+
+    if filters.url_prefix:
+        query = query.where(TextSummary.url.like(_like_prefix(filters.url_prefix)))
+    if filters.domain:
+        query = query.where(TextSummary.domain == filters.domain.lower().rstrip("."))
+    if filters.created_after:
+        query = query.where(TextSummary.created_at >= _utc(filters.created_after))
+    if filters.created_before:
+        query = query.where(TextSummary.created_at < _utc(filters.created_before))
+    if filters.status == "pending":
+        query = query.where(TextSummary.summary == "")
+    elif filters.status == "complete":
+        query = query.where(TextSummary.summary != "")
+    if filters.q:
+        query = query.where(
+            summary_search_vector(TextSummary.summary).op("@@")(
+                func.websearch_to_tsquery(SEARCH_CONFIG, filters.q)
+            )
+        )
+
+    descending = filters.sort.startswith("-")
+    sort_column = SORT_COLUMNS[filters.sort.lstrip("-")]
+    # Ties on the sort column are broken by id, which makes the order total
+    key = (sort_column, TextSummary.id) if sort_column is not TextSummary.id else ()
+    if after is not None:
+        cursor = _cursor(key, after, descending) if key else after
+        position = tuple_(*key) if key else TextSummary.id
+        query = query.where(position < cursor if descending else position > cursor)
+
+    order = key or (TextSummary.id,)
+    return query.order_by(
+        *(column.desc() if descending else column for column in order)
+    )
+
+
+def _cursor(key, after: int, descending: bool):
+    """
+    Sort key of the `after` row, or if it was deleted since, of the nearest
+    remaining row before it by id (ids follow created_at for rows inserted
+    in order), or one that sorts before every row. Each value is a scalar
+    subquery evaluated once, so the comparison stays an index range.
+    """
+    row = aliased(TextSummary)
+    nearest = select(*(getattr(row, column.key) for column in key))
+    if descending:
+        nearest = nearest.where(row.id >= after).order_by(row.id)
+        first = (literal("infinity").cast(DateTime), literal(after))
+    else:
+        nearest = nearest.where(row.id <= after).order_by(row.id.desc())
+        first = (literal("-infinity").cast(DateTime), literal(0))
+    nearest = nearest.limit(1).subquery()
+    return tuple_(
+        *(
+            func.coalesce(select(nearest.c[column.key]).scalar_subquery(), default)
+            for column, default in zip(key, first)
+        )
+    )
+
+
+def _like_prefix(prefix: str) -> str:
+    # Backslash is the default LIKE escape character in Postgres
+    for char in ("\\", "%", "_"):
+        prefix = prefix.replace(char, "\\" + char)
+    return prefix + "%"
+
+
+def _utc(value: datetime) -> datetime:
+    """created_at is stored as naive UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def get_all_versions(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    filters: Optional[SummaryFilterSchema] = None,
+) -> List[Tuple[int, datetime]]:
+    query = _all_query(after, filters).with_only_columns(
+        TextSummary.id, TextSummary.updated_at
+    )
+    result = await db.execute(query.limit(limit))
+    return result.all()
+
+
+async def get_all(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    filters: Optional[SummaryFilterSchema] = None,
+) -> List[TextSummary]:
+    result = await db.execute(_all_query(after, filters).limit(limit))
     return result.scalars().all()
 
 
-async def delete(id: int, db: AsyncSession) -> Optional[TextSummary]:
-    summary = await get(id, db)
-    if summary:
-        await db.delete(summary)
-        await db.commit()
-    return summary
+async def get_all_rows(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    fields: Optional[Iterable[str]] = None,
+    filters: Optional[SummaryFilterSchema] = None,
+) -> List[dict]:
+    """
+    Like `get_all`, as dicts of SUMMARY_COLUMNS, or of the given LIST_COLUMNS
+    `fields` (plus id and updated_at) so unneeded columns are never read.
+    """
+    query = _all_query(after, filters).with_only_columns(*_list_columns(fields))
+    result = await db.execute(query.limit(limit))
+    return [row._asdict() for row in result]
+
+
+async def stream_all_rows(
+    db: AsyncSession,
+    after: Optional[int] = None,
+    batch_size: int = 500,
+    fields: Optional[Iterable[str]] = None,
+    filters: Optional[SummaryFilterSchema] = None,
+) -> AsyncIterator[dict]:
+    """All summaries from `after` on as `get_all_rows` dicts, in batches."""
+    result = await db.stream(
+        _all_query(after, filters)
+        .with_only_columns(*_list_columns(fields))
+        .execution_options(yield_per=batch_size)
+    )
+    async for row in result:
+        yield row._asdict()
+
+
+async def delete(id: int, db: AsyncSession) -> Optional[SummaryResponseSchema]:
+    result = await db.execute(
+        sql_delete(TextSummary)
+        .where(TextSummary.id == id)
+        .returning(
+            TextSummary.id,
+            TextSummary.url,
+            summary_updated_notification(TextSummary.id),
+        )
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    await db.commit()
+    await summary_cache.delete(summary_key(id))
+    return SummaryResponseSchema.model_validate(row, from_attributes=True)
 
 
 async def put(
     id: int, payload: SummaryUpdatePayloadSchema, db: AsyncSession
-) -> Union[TextSummary, None]:
-    # Fetch the existing summary
-    result = await db.execute(select(TextSummary).where(TextSummary.id == id))
-    summary = result.scalars().first()
-    if not summary:
+) -> Union[SummaryRecordSchema, None]:
+    url = str(payload.url)
+    result = await db.execute(
+        update(TextSummary)
+        .where(TextSummary.id == id)
+        .values(url=url, normalized_url=normalize_url(url), summary=payload.summary)
+        .returning(
+            TextSummary.id,
+            TextSummary.url,
+            TextSummary.summary,
+            TextSummary.created_at,
+            TextSummary.updated_at,
+            summary_updated_notification(TextSummary.id),
+        )
+    )
+    row = result.first()
+    if row is None:
         return None
 
-    # Update fields
-    summary.url = str(payload.url)
-    summary.summary = payload.summary
-
     await db.commit()
-    await db.refresh(summary)
-    return summary
+    await summary_cache.delete(summary_key(id))
+    return SummaryRecordSchema.model_validate(row, from_attributes=True)
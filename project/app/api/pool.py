@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.db import sessionmanager
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def pool_stats():
+    return sessionmanager.pool_stats()
@@ -1,74 +1,438 @@
-from typing import List
+import asyncio
+import json
+from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api import crud
-from app.db import get_db_session
+from app.api import conditional, crud
+from app.config import Settings, get_settings
+from app.db import (
+    get_db_session,
+    get_db_session_factory,
+    get_read_db_session,
+    get_read_db_session_factory,
+)
 from app.models.pydantic import (
     SummaryPayloadSchema,
+    SummaryRecordSchema,
+    SummaryField,
+    SummaryFilterSchema,
     SummaryResponseSchema,
+    SummaryRow,
     SummarySchema,
     SummaryUpdatePayloadSchema,
 )
-from app.summarizer import generate_summary
+from app.notifications import SummaryNotifier, get_summary_notifier
 
 router = APIRouter()
 
+bulk_payload_adapter = TypeAdapter(List[SummaryPayloadSchema])
+# Single summaries are serialized by these instead of response_model
+summary_adapter = TypeAdapter(SummarySchema)
+summary_response_adapter = TypeAdapter(SummaryResponseSchema)
+summary_responses_adapter = TypeAdapter(List[SummaryResponseSchema])
+# Listings serialize selected rows directly, skipping a SummarySchema per row
+summary_row_adapter = TypeAdapter(SummaryRow)
+summary_rows_adapter = TypeAdapter(List[SummaryRow])
+summary_fields_adapter = TypeAdapter(List[SummaryField])
+
 
 @router.post("/", response_model=SummaryResponseSchema, status_code=201)
 async def create_summary(
     payload: SummaryPayloadSchema,
-    background_tasks: BackgroundTasks,
+    response: Response,
+    refresh: bool = False,
     db: AsyncSession = Depends(get_db_session),
+    settings: Settings = Depends(get_settings),
 ) -> SummaryResponseSchema:
-    summary_id = await crud.post(payload, db)
+    summary_id = await crud.post(
+        payload, db, refresh=refresh, ttl=settings.summary_ttl_seconds
+    )
+
+    # The payload is validated already
+    summary = SummaryResponseSchema.model_construct(id=summary_id, url=payload.url)
+    return _model_response(summary_response_adapter, summary, 201, response)
+
+
+@router.post("/bulk/", response_model=List[SummaryResponseSchema], status_code=201)
+async def create_summaries_bulk(
+    request: Request,
+    response: Response,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+    settings: Settings = Depends(get_settings),
+) -> List[SummaryResponseSchema]:
+    """
+    Accepts a JSON array of `{"url": ...}` objects, or one object per line
+    with `Content-Type: application/x-ndjson`. Ids are returned in request order.
+    NDJSON errors are reported by line number, starting at 1.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        payloads = _parse_ndjson(body)
+    else:
+        try:
+            payloads = bulk_payload_adapter.validate_json(body)
+        except ValidationError as exc:
+            raise _body_validation_error(exc)
+
+    if not payloads:
+        return _json_response(summary_responses_adapter.dump_json([]), 201, response)
+    if len(payloads) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.bulk_max_items} summaries per request",
+        )
+
+    summary_ids = await crud.post_bulk(
+        payloads,
+        db,
+        batch_size=settings.bulk_batch_size,
+        refresh=refresh,
+        ttl=settings.summary_ttl_seconds,
+    )
+
+    summaries = [
+        SummaryResponseSchema.model_construct(id=summary_id, url=payload.url)
+        for summary_id, payload in zip(summary_ids, payloads)
+    ]
+    return _json_response(summary_responses_adapter.dump_json(summaries), 201, response)
+
+
+def _parse_ndjson(body: bytes) -> List[SummaryPayloadSchema]:
+    """Payloads of an NDJSON body, each line exactly one JSON object."""
+    payloads, errors = [], []
+    for number, line in enumerate(body.splitlines(), 1):
+        try:
+            payloads.append(SummaryPayloadSchema.model_validate_json(line))
+        except ValidationError as exc:
+            errors += _body_validation_error(exc, number).errors()
+    if errors:
+        raise RequestValidationError(errors)
+    return payloads
+
 
-    background_tasks.add_task(generate_summary, summary_id, str(payload.url))
+def _body_validation_error(exc: ValidationError, *loc) -> RequestValidationError:
+    errors = exc.errors(include_url=False)
+    for error in errors:
+        error["loc"] = ("body", *loc, *error["loc"])
+    return RequestValidationError(errors)
 
-    response_object = {"id": summary_id, "url": payload.url}
-    return response_object
+
+def _json_response(
+    content: bytes, status_code: int = 200, sub_response: Optional[Response] = None
+) -> Response:
+    """
+    FastAPI only copies the headers and cookies set on the injected
+    `sub_response` (e.g. get_db_session's read-your-writes cookie) onto
+    responses it builds itself, so a returned Response needs them copied.
+    """
+    response = Response(content, status_code=status_code, media_type="application/json")
+    if sub_response is not None:
+        response.raw_headers.extend(
+            (name, value)
+            for name, value in sub_response.raw_headers
+            if name != b"content-length"
+        )
+    return response
+
+
+def _model_response(
+    adapter: TypeAdapter,
+    value,
+    status_code: int = 200,
+    sub_response: Optional[Response] = None,
+) -> Response:
+    """
+    `value` serialized by `adapter`. Returning a Response skips FastAPI's
+    response_model handling, which would validate the model again: models
+    from crud are validated once, when they are built from the row.
+    """
+    if not isinstance(value, BaseModel):
+        value = adapter.validate_python(value)
+    return _json_response(adapter.dump_json(value), status_code, sub_response)
 
 
 @router.get("/{id}/", response_model=SummarySchema)
 async def read_summary(
-    id: int = Path(..., gt=0), db: AsyncSession = Depends(get_db_session)
+    request: Request,
+    id: int = Path(..., gt=0),
+    wait: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db_session),
+    primary_session_factory=Depends(get_db_session_factory),
+    notifier: SummaryNotifier = Depends(get_summary_notifier),
+    settings: Settings = Depends(get_settings),
 ) -> SummarySchema:
-    summary = await crud.get(id, db)
+    """
+    With `wait`, a pending summary is long-polled: the response is held for
+    up to `wait` seconds (capped by the server) until the summary is done.
+    """
+    if conditional.is_conditional(request):
+        # Revalidate from the cache or from updated_at alone, never the text
+        cached = await crud.peek_cached(id)
+        updated_at = cached.updated_at if cached else await crud.get_version(id, db)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Summary not found")
+
+        etag = conditional.summary_etag(id, updated_at)
+        modified = conditional.last_modified(updated_at)
+        if conditional.not_modified(request, etag, modified):
+            return conditional.not_modified_response(etag, modified)
+
+    if wait:
+        summary = await _wait_for_summary(
+            id,
+            min(wait, settings.long_poll_max_seconds),
+            db,
+            primary_session_factory,
+            notifier,
+        )
+    else:
+        summary = await crud.get_cached(id, db)
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
 
-    return summary
+    response = _model_response(summary_adapter, summary)
+    if summary.updated_at is not None:
+        conditional.set_validators(
+            response,
+            conditional.summary_etag(id, summary.updated_at),
+            conditional.last_modified(summary.updated_at),
+        )
+    return response
+
+
+async def _wait_for_summary(
+    id: int,
+    timeout: float,
+    db: AsyncSession,
+    primary_session_factory,
+    notifier: SummaryNotifier,
+) -> Optional[SummaryRecordSchema]:
+    async with notifier.subscribe(id) as updated:
+        summary = await crud.get_cached(id, db)
+        if summary is None or summary.summary:
+            return summary
+
+        # Don't hold a pooled connection while waiting
+        await db.close()
+        try:
+            await asyncio.wait_for(updated.wait(), timeout)
+        except asyncio.TimeoutError:
+            return summary
+
+    # `db` may be a lagging replica that hasn't seen the notified change yet
+    async with primary_session_factory() as primary:
+        return await crud.get_cached(id, primary)
+
+
+@router.get("/{id}/events/")
+async def summary_events(
+    id: int = Path(..., gt=0),
+    db: AsyncSession = Depends(get_read_db_session),
+    session_factory=Depends(get_read_db_session_factory),
+    primary_session_factory=Depends(get_db_session_factory),
+    notifier: SummaryNotifier = Depends(get_summary_notifier),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """
+    Server-sent events: a `completed` event with the summary once it is done
+    (immediately if it already is), `deleted` if it disappears, or `timeout`.
+    """
+    if await crud.get_version(id, db) is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    await db.close()
+
+    return StreamingResponse(
+        _summary_events(
+            id,
+            session_factory,
+            primary_session_factory,
+            notifier,
+            settings.sse_keepalive_seconds,
+            settings.sse_max_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _summary_events(
+    id: int,
+    session_factory,
+    primary_session_factory,
+    notifier: SummaryNotifier,
+    keepalive: float,
+    max_seconds: float,
+):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+
+    async with notifier.subscribe(id) as updated:
+        while True:
+            # After a notification, read the change from the primary: a
+            # lagging replica would only show it at a later keepalive
+            factory = primary_session_factory if updated.is_set() else session_factory
+            updated.clear()
+            async with factory() as db:
+                summary = await crud.get_cached(id, db)
 
+            if summary is None:
+                yield _sse("deleted", json.dumps({"id": id}))
+                return
+            if summary.summary:
+                yield _sse("completed", summary.model_dump_json(exclude={"updated_at"}))
+                return
 
-@router.get("/", response_model=List[SummarySchema])
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                yield _sse("timeout", json.dumps({"id": id}))
+                return
+            try:
+                await asyncio.wait_for(updated.wait(), min(keepalive, remaining))
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.get("/", response_model=List[SummaryRow])
 async def read_all_summaries(
-    db: AsyncSession = Depends(get_db_session),
-) -> List[SummarySchema]:
-    return await crud.get_all(db)
+    request: Request,
+    limit: Optional[int] = Query(
+        None, gt=0, le=1000, description="Page size, default 100"
+    ),
+    after: Optional[int] = Query(None, ge=0),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated fields to return, "
+        "default id,url,created_at,status",
+    ),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_read_db_session),
+    session_factory=Depends(get_read_db_session_factory),
+    filters: SummaryFilterSchema = Depends(),
+) -> List[SummaryRow]:
+    """
+    Lists summaries without their text unless `fields` asks for `summary`;
+    only the requested columns are selected. `q` is a web search style query
+    (quoted phrases, `or`, `-word`) over the summary text. With `stream`,
+    every matching summary is returned as NDJSON, so `limit` is rejected.
+    """
+    fields = _parse_fields(fields)
+    include = set(fields)
+
+    if stream:
+        if limit is not None:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "value_error",
+                        "loc": ("query", "limit"),
+                        "msg": "limit can't be combined with stream, "
+                        "which returns every summary",
+                        "input": limit,
+                    }
+                ]
+            )
+        return StreamingResponse(
+            _stream_summaries(session_factory, after, filters, fields, include),
+            media_type="application/x-ndjson",
+        )
+
+    limit = limit or 100
+    variant = ",".join(fields)
+    if conditional.is_conditional(request):
+        versions = await crud.get_all_versions(
+            db, limit=limit + 1, after=after, filters=filters
+        )
+        etag, modified = conditional.collection_validators(versions, variant)
+        if conditional.not_modified(request, etag, modified):
+            return conditional.not_modified_response(etag, modified)
+
+    # Fetch one extra row to know whether there is a next page
+    rows = await crud.get_all_rows(
+        db, limit=limit + 1, after=after, fields=fields, filters=filters
+    )
+    validators = conditional.collection_validators(
+        ((row["id"], row["updated_at"]) for row in rows), variant
+    )
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_url = request.url.include_query_params(after=rows[-1]["id"])
+
+    response = _json_response(
+        summary_rows_adapter.dump_json(rows, include={"__all__": include})
+    )
+    conditional.set_validators(response, *validators)
+    if next_url is not None:
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    names = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    if not names:
+        return list(crud.DEFAULT_LIST_FIELDS)
+
+    try:
+        return list(dict.fromkeys(summary_fields_adapter.validate_python(names)))
+    except ValidationError as exc:
+        errors = exc.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("query", "fields", *error["loc"])
+        raise RequestValidationError(errors)
+
+
+async def _stream_summaries(
+    session_factory,
+    after: Optional[int],
+    filters: SummaryFilterSchema,
+    fields: List[str],
+    include: set,
+):
+    async with session_factory() as db:
+        rows = crud.stream_all_rows(db, after=after, fields=fields, filters=filters)
+        async for row in rows:
+            yield summary_row_adapter.dump_json(row, include=include) + b"\n"
 
 
 @router.delete("/{id}/", response_model=SummaryResponseSchema)
 async def delete_summary(
-    id: int = Path(..., gt=0), db: AsyncSession = Depends(get_db_session)
+    response: Response,
+    id: int = Path(..., gt=0),
+    db: AsyncSession = Depends(get_db_session),
 ) -> SummaryResponseSchema:
-    summary = await crud.get(id, db)
+    summary = await crud.delete(id, db)
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
 
-    await crud.delete(id, db)
-
-    return summary
+    return _model_response(summary_response_adapter, summary, 200, response)
 
 
 @router.put("/{id}/", response_model=SummarySchema)
 async def update_summary(
     payload: SummaryUpdatePayloadSchema,
+    response: Response,
     id: int = Path(..., gt=0),
     db: AsyncSession = Depends(get_db_session),
 ) -> SummarySchema:
-    summary = await crud.put(id, payload, db)
+    try:
+        summary = await crud.put(id, payload, db)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="A summary for this URL already exists"
+        )
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
 
-    return summary
+    return _model_response(summary_adapter, summary, 200, response)
@@ -0,0 +1,135 @@
+"""
+Micro-batching of the summarizer's NLP step.
+
+Jobs whose summary is not cached hand their extracted article to a
+SummaryBatcher instead of the process pool. It collects up to `batch_size`
+articles, waiting at most `max_wait` seconds after the first one, and
+summarizes them in one pool call (`summarize_batch`), so the backend scores
+the whole batch at once. The summaries are stored in the content cache with
+one statement and saved with one more, or handed to a ResultWriter. At most
+`max_in_flight` batches run at a time, one per pool process; while they run,
+the next batch fills up.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.content_cache import content_cache
+from app.db import sessionmanager
+from app.metrics import SUMMARIZER_BATCH_FILL
+from app.result_writer import ResultWriter
+from app.summarizer import save_summaries, summarize_batch
+
+
+class BatchItem(NamedTuple):
+    summary_id: int
+    content_hash: str
+    article: Tuple[str, str]
+    future: asyncio.Future
+
+
+class SummaryBatcher:
+    def __init__(
+        self,
+        executor: Executor,
+        batch_size: int = 8,
+        max_wait: float = 0.05,
+        max_in_flight: int = 2,
+        writer: Optional[ResultWriter] = None,
+    ):
+        self._executor = executor
+        self._writer = writer
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._max_in_flight = max_in_flight
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._collector is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+            self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        if self._collector is None:
+            return
+        tasks = [self._collector, *self._batches]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._collector = None
+        self._queue = None
+
+    async def summarize(
+        self, summary_id: int, content_hash: str, article: Tuple[str, str]
+    ) -> None:
+        """
+        Summarize an extracted article in the next batch, store the summary
+        in the content cache and save it. Returns once it is saved.
+        """
+        if self._collector is None:
+            raise Exception("SummaryBatcher is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(BatchItem(summary_id, content_hash, article, future))
+        await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Jobs that timed out while waiting are not summarized
+            batch = [item for item in batch if not item.future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._process(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _process(self, batch: List[BatchItem]) -> None:
+        SUMMARIZER_BATCH_FILL.observe(len(batch) / self.batch_size)
+        try:
+            loop = asyncio.get_running_loop()
+            summaries = await loop.run_in_executor(
+                self._executor, summarize_batch, [item.article for item in batch]
+            )
+            async with sessionmanager.session() as db:
+                await content_cache.store_summaries(
+                    {item.content_hash: s for item, s in zip(batch, summaries)}, db
+                )
+            save = self._writer.write if self._writer is not None else save_summaries
+            await save([(item.summary_id, s) for item, s in zip(batch, summaries)])
+        except asyncio.CancelledError:
+            for item in batch:
+                item.future.cancel()
+            raise
+        except Exception as exc:
+            # Every job of the batch fails, and is logged, with the error
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        else:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_result(None)
+        finally:
+            self._slots.release()
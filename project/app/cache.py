@@ -0,0 +1,161 @@
+"""
+Read-through cache for summaries.
+
+The default backend is an in-process LRU with a TTL and a size bound. Each
+API process drops its entries when the summary notifications report a
+change made elsewhere (the worker), see app/notifications.py. A
+Redis-compatible backend can be shared by all API and worker processes;
+any client exposing async `get`, `set(..., ex=...)` and `delete` works, so
+tests and local setups can pass a fake one.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import Settings, get_settings
+
+settings = get_settings()
+
+
+class BaseCache:
+    backend = "none"
+
+    def __init__(self, ttl: int = 300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def peek(self, key: str) -> Optional[Any]:
+        """Like `get`, but without touching the hit/miss counters."""
+        return await self._get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._set(key, value)
+
+    async def delete(self, key: str) -> None:
+        await self._delete(key)
+
+    def forget(self, key: str) -> None:
+        """
+        Drop a local entry changed by another process. Shared backends are
+        invalidated by the writer itself, so they have nothing to drop.
+        """
+
+    def forget_all(self) -> None:
+        """Drop every local entry, keeping the counters."""
+
+    def clear(self) -> None:
+        """Reset the counters and drop local entries (a shared backend is kept)."""
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    async def _get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def _set(self, key: str, value: Any) -> None:
+        pass
+
+    async def _delete(self, key: str) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    backend = "memory"
+
+    def __init__(self, ttl: int = 300, max_entries: int = 10000):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def forget_all(self) -> None:
+        self._entries.clear()
+
+    def clear(self) -> None:
+        super().clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries)}
+
+    async def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisCache(BaseCache):
+    backend = "redis"
+
+    def __init__(self, client, ttl: int = 300, prefix: str = ""):
+        super().__init__(ttl)
+        self._client = client
+        self._prefix = prefix
+
+    async def _get(self, key: str) -> Optional[Any]:
+        value = await self._client.get(self._prefix + key)
+        return None if value is None else json.loads(value)
+
+    async def _set(self, key: str, value: Any) -> None:
+        await self._client.set(self._prefix + key, json.dumps(value), ex=self.ttl)
+
+    async def _delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+
+def summary_key(id: int) -> str:
+    return f"summary:{id}"
+
+
+def create_cache(settings: Settings) -> BaseCache:
+    if settings.cache_backend == "memory":
+        return MemoryCache(
+            ttl=settings.cache_ttl_seconds, max_entries=settings.cache_max_entries
+        )
+    if settings.cache_backend == "redis":
+        # Optional dependency, only needed when the Redis backend is enabled
+        import redis.asyncio as redis
+
+        return RedisCache(
+            redis.from_url(settings.cache_url), ttl=settings.cache_ttl_seconds
+        )
+    return BaseCache()
+
+
+summary_cache = create_cache(settings)
@@ -1,5 +1,6 @@
 import logging
 from functools import lru_cache
+from typing import Optional
 from pydantic import AnyUrl
 from pydantic_settings import BaseSettings
 
@@ -14,6 +15,75 @@ class Settings(BaseSettings):
     project_name: str = "My FastAPI project"
     log_level: str = "DEBUG"
     echo_sql: bool = bool(0)
+    # Log statements slower than this many seconds, with the calling route
+    slow_query_threshold: Optional[float] = None
+    # Request profiling, see app/profiling.py
+    profiling_sample_rate: float = 0.0
+    profiling_token: Optional[str] = None
+    profiling_dir: Optional[str] = None
+    # Connection pool, per process: keep
+    # (web workers + worker processes) * (pool size + overflow) < max_connections
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = bool(0)
+    db_pool_warn_after: float = 0.1
+    # Read replicas, e.g. DATABASE_REPLICA_URLS='["postgresql+asyncpg://..."]'
+    database_replica_urls: list[str] = []
+    database_replica_selection: str = "round_robin"  # or "least_busy"
+    read_your_writes_seconds: float = 5.0
+    # asyncpg prepared statement cache, set to 0 behind pgbouncer
+    db_statement_cache_size: int = 100
+    summary_ttl_seconds: Optional[int] = None
+    # Read-through cache: "memory", "redis" (needs the redis package) or "none"
+    cache_backend: str = "memory"
+    cache_url: Optional[str] = None
+    cache_ttl_seconds: int = 300
+    cache_max_entries: int = 10000
+    # Response class of routes returning plain data: "json" or "orjson"
+    # (needs the orjson package). Summary routes serialize their models
+    # themselves, see app/api/summaries.py
+    json_response: str = "json"
+    bulk_max_items: int = 10000
+    bulk_batch_size: int = 1000
+    long_poll_max_seconds: int = 60
+    sse_keepalive_seconds: float = 15.0
+    sse_max_seconds: int = 300
+    # Summarization engine
+    summarizer_processes: int = 2
+    summarizer_concurrency: int = 4
+    summarizer_queue_size: int = 100
+    summarizer_job_timeout: float = 60.0
+    summarizer_fetch_timeout: float = 10.0  # read timeout
+    # "newspaper" or "numpy", see app/summarizer_backends.py
+    summarizer_backend: str = "newspaper"
+    # Micro-batches of articles per pool call, see app/batcher.py. A batch
+    # holds at most summarizer_concurrency jobs; 1 turns batching off and
+    # sends every article to the pool on its own
+    summarizer_batch_size: int = 4
+    summarizer_batch_max_wait: float = 0.05
+    # Finished summaries are saved together, see app/result_writer.py
+    summary_write_batch_size: int = 100
+    summary_write_interval: float = 0.1
+    # Article fetcher, see app/fetcher.py
+    fetch_connect_timeout: float = 5.0
+    fetch_max_connections: int = 100
+    fetch_per_host_limit: int = 4
+    fetch_max_bytes: int = 5 * 1024 * 1024
+    fetch_max_redirects: int = 5
+    # Fetched page / summary cache size budgets, see app/content_cache.py
+    content_cache_page_max_bytes: int = 256 * 1024 * 1024
+    content_cache_summary_max_bytes: int = 64 * 1024 * 1024
+    # Durable job queue / worker
+    worker_concurrency: int = 4
+    worker_poll_interval: float = 1.0
+    worker_lease_seconds: int = 300
+    worker_max_attempts: int = 5
+    worker_backoff_base: float = 10.0
+    worker_backoff_max: float = 3600.0
+    # Serve the worker's Prometheus metrics on this port
+    worker_metrics_port: Optional[int] = None
 
 @lru_cache()
 def get_settings() -> BaseSettings:
@@ -0,0 +1,177 @@
+"""
+Content-addressed cache of fetched pages and computed summaries.
+
+Pages are stored per URL with their ETag / Last-Modified, so a refetch is a
+conditional request and an unchanged page costs neither the download nor the
+parse. Summaries are stored per sha256 of the extracted title and text, so
+the same article served under different URLs (syndication, tracking links,
+mirrors) goes through the NLP once.
+
+Both tables live in Postgres, shared by every worker. Once they grow past
+their size budget, the least recently used rows are evicted. Lookups are
+plain SELECTs: the rows they hit are remembered and their `accessed_at`
+is updated by the cache's next write or eviction, in its transaction, so
+a cache hit costs no write transaction of its own.
+"""
+
+import hashlib
+from typing import Dict, Optional, Set, Type, Union
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.fetcher import Page
+from app.models.sqlalchemy import ContentSummary, FetchedPage
+
+settings = get_settings()
+
+
+def content_hash(title: str, text: str) -> str:
+    """
+    Fingerprint of an extracted article, never of the page's HTML, so markup
+    that changes on every fetch (nonces, inline timestamps, reflowed
+    whitespace) doesn't defeat the summary cache.
+    """
+    title, text = " ".join(title.split()), " ".join(text.split())
+    return hashlib.sha256(f"{title}\0{text}".encode()).hexdigest()
+
+
+class ContentCache:
+    def __init__(
+        self,
+        page_max_bytes: int = 256 * 1024 * 1024,
+        summary_max_bytes: int = 64 * 1024 * 1024,
+        evict_every: int = 100,
+    ):
+        self.page_max_bytes = page_max_bytes
+        self.summary_max_bytes = summary_max_bytes
+        # Summing the table sizes is a scan, so only check every N writes
+        self.evict_every = evict_every
+        self._writes = 0
+        # Keys read since the last write, whose accessed_at is not updated yet
+        self._accessed_pages: Set[str] = set()
+        self._accessed_summaries: Set[str] = set()
+
+    async def get_page(self, url: str, db: AsyncSession) -> Optional[FetchedPage]:
+        page = await db.scalar(select(FetchedPage).where(FetchedPage.url == url))
+        if page is not None:
+            self._accessed_pages.add(url)
+        return page
+
+    async def store_page(
+        self, url: str, page: Page, content_hash: str, db: AsyncSession
+    ) -> None:
+        values = {
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "content_hash": content_hash,
+            "html": page.html,
+            "size": len(page.html.encode()),
+            "fetched_at": func.now(),
+            "accessed_at": func.now(),
+        }
+        await db.execute(
+            pg_insert(FetchedPage)
+            .values(url=url, **values)
+            .on_conflict_do_update(index_elements=[FetchedPage.url], set_=values)
+        )
+        await self._written(db)
+
+    async def get_summary(self, content_hash: str, db: AsyncSession) -> Optional[str]:
+        summary = await db.scalar(
+            select(ContentSummary.summary).where(
+                ContentSummary.content_hash == content_hash
+            )
+        )
+        if summary is not None:
+            self._accessed_summaries.add(content_hash)
+        return summary
+
+    async def store_summary(
+        self, content_hash: str, summary: str, db: AsyncSession
+    ) -> None:
+        await self.store_summaries({content_hash: summary}, db)
+
+    async def store_summaries(
+        self, summaries: Dict[str, str], db: AsyncSession
+    ) -> None:
+        """Store summaries by content hash, in one multi-row INSERT."""
+        await db.execute(
+            pg_insert(ContentSummary)
+            .values(
+                [
+                    {
+                        "content_hash": content_hash,
+                        "summary": summary,
+                        "size": len(summary.encode()),
+                    }
+                    for content_hash, summary in summaries.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[ContentSummary.content_hash])
+        )
+        await self._written(db)
+
+    async def evict(self, db: AsyncSession) -> None:
+        await self._touch(db)
+        await _evict(FetchedPage, FetchedPage.url, self.page_max_bytes, db)
+        await _evict(
+            ContentSummary, ContentSummary.content_hash, self.summary_max_bytes, db
+        )
+        await db.commit()
+
+    async def _touch(self, db: AsyncSession) -> None:
+        """Update `accessed_at` of the rows read since the last write."""
+        pages, self._accessed_pages = self._accessed_pages, set()
+        summaries, self._accessed_summaries = self._accessed_summaries, set()
+        if pages:
+            await db.execute(
+                update(FetchedPage)
+                .where(FetchedPage.url.in_(pages))
+                .values(accessed_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        if summaries:
+            await db.execute(
+                update(ContentSummary)
+                .where(ContentSummary.content_hash.in_(summaries))
+                .values(accessed_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _written(self, db: AsyncSession) -> None:
+        await self._touch(db)
+        await db.commit()
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            await self.evict(db)
+
+
+async def _evict(
+    model: Type[Union[FetchedPage, ContentSummary]],
+    key,
+    max_bytes: int,
+    db: AsyncSession,
+) -> None:
+    """Delete the least recently used rows beyond `max_bytes` in total."""
+    running = (
+        select(
+            key.label("key"),
+            func.sum(model.size)
+            .over(order_by=(model.accessed_at.desc(), key))
+            .label("total"),
+        )
+    ).subquery()
+    await db.execute(
+        delete(model).where(
+            key.in_(select(running.c.key).where(running.c.total > max_bytes))
+        )
+    )
+
+
+content_cache = ContentCache(
+    page_max_bytes=settings.content_cache_page_max_bytes,
+    summary_max_bytes=settings.content_cache_summary_max_bytes,
+)
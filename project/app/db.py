@@ -22,38 +22,179 @@
 #        await conn.run_sync(Base.metadata.create_all)
 
 import os
+import bisect
 import contextlib
-from typing import Any, AsyncIterator
+import functools
+import logging
+import time
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Optional, Sequence
 
+from fastapi import Depends, Request, Response
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
 settings = get_settings()
 
+log = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout wait times and timeouts of an InstrumentedQueuePool."""
+
+    buckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+    def __init__(self, warn_after: float = 0.1):
+        self.warn_after = warn_after
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_counts = [0] * len(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            # Cumulative, Prometheus style: checkouts that waited <= le seconds
+            "wait_seconds_histogram": {
+                str(le): count
+                for le, count in zip(
+                    self.buckets,
+                    [sum(self.wait_counts[: i + 1]) for i in range(len(self.buckets))],
+                )
+            },
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait."""
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.timeouts += 1
+            log.warning(
+                "Timed out waiting for a database connection: %s", self.status()
+            )
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            if self.stats is not None:
+                self.stats.observe(waited)
+                if waited > self.stats.warn_after:
+                    log.warning(
+                        "Waited %.1fms for a database connection: %s",
+                        waited * 1000,
+                        self.status(),
+                    )
+
+
+def engine_kwargs_from_settings(settings: Settings) -> dict[str, Any]:
+    return {
+        "echo": settings.echo_sql,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {"statement_cache_size": settings.db_statement_cache_size},
+    }
+
 
 # Heavily inspired by https://praciano.com.br/fastapi-and-async-sqlalchemy-20-with-pytest-done-right.html
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
-        self._engine = create_async_engine(host, **engine_kwargs)
+    """
+    Owns the primary engine and, optionally, read replica engines.
+    `session()` always uses the primary, `read_session()` a replica picked
+    round-robin or by fewest checked out connections ("least_busy").
+    """
+
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        pool_warn_after: float = 0.1,
+        replica_hosts: Sequence[str] = (),
+        replica_selection: str = "round_robin",
+    ):
+        engine_kwargs = {"poolclass": InstrumentedQueuePool, **engine_kwargs}
+        self._pool_warn_after = pool_warn_after
+
+        self._engine = self._create_engine(host, engine_kwargs)
         self._sessionmaker = async_sessionmaker(
             autocommit=False, bind=self._engine, expire_on_commit=False
         )
 
+        self._replicas = [
+            self._create_engine(replica_host, engine_kwargs)
+            for replica_host in replica_hosts
+        ]
+        self._replica_sessionmakers = [
+            async_sessionmaker(
+                autocommit=False,
+                bind=replica,
+                expire_on_commit=False,
+                info={"replica": True},
+            )
+            for replica in self._replicas
+        ]
+        self._replica_selection = replica_selection
+        self._next_replica = 0
+
+    def _create_engine(self, host: str, engine_kwargs: dict[str, Any]) -> AsyncEngine:
+        engine = create_async_engine(host, **engine_kwargs)
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.stats = PoolStats(warn_after=self._pool_warn_after)
+        return engine
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def pool_stats(self) -> dict:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        stats = _engine_pool_stats(self._engine)
+        if self._replicas:
+            stats["replicas"] = [
+                _engine_pool_stats(replica) for replica in self._replicas
+            ]
+        return stats
+
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._replicas = []
+        self._replica_sessionmakers = []
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -72,7 +213,44 @@ class DatabaseSessionManager:
         if self._sessionmaker is None:
             raise Exception("DatabaseSessionManager is not initialized")
 
-        session = self._sessionmaker()
+        async with self._session(self._sessionmaker) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Session on a read replica, or on the primary if there are none."""
+        if self._sessionmaker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        async with self._session(self._pick_replica()) as session:
+            yield session
+
+    def read_session_factory(self) -> Callable[[], AsyncContextManager[AsyncSession]]:
+        """Like `read_session`, but every session uses the same replica."""
+        if self._sessionmaker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        return functools.partial(self._session, self._pick_replica())
+
+    def _pick_replica(self) -> async_sessionmaker:
+        if not self._replica_sessionmakers:
+            return self._sessionmaker
+
+        if self._replica_selection == "least_busy":
+            index = min(
+                range(len(self._replicas)),
+                key=lambda i: self._replicas[i].pool.checkedout(),
+            )
+        else:
+            index = self._next_replica % len(self._replicas)
+            self._next_replica = index + 1
+        return self._replica_sessionmakers[index]
+
+    @contextlib.asynccontextmanager
+    async def _session(
+        self, sessionmaker: async_sessionmaker
+    ) -> AsyncIterator[AsyncSession]:
+        session = sessionmaker()
         try:
             yield session
         except Exception:
@@ -82,9 +260,75 @@ class DatabaseSessionManager:
             await session.close()
 
 
-sessionmanager = DatabaseSessionManager(DATABASE_URL, {"echo": settings.echo_sql})
+def is_replica(session: AsyncSession) -> bool:
+    """Whether `session` reads from a replica, which may lag the primary."""
+    return session.info.get("replica", False)
+
+
+def _engine_pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    stats = {"status": pool.status()}
+    if isinstance(pool, InstrumentedQueuePool) and pool.stats is not None:
+        stats.update(pool.stats.as_dict())
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
 
 
-async def get_db_session():
+sessionmanager = DatabaseSessionManager(
+    DATABASE_URL,
+    engine_kwargs_from_settings(settings),
+    pool_warn_after=settings.db_pool_warn_after,
+    replica_hosts=settings.database_replica_urls,
+    replica_selection=settings.database_replica_selection,
+)
+
+# Read-your-writes: after a write, the client's reads go to the primary
+# until this cookie expires, so replica lag can't hide its own changes.
+PRIMARY_COOKIE = "db-primary-until"
+
+
+def _wants_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_db_session(request: Request, response: Response):
+    if sessionmanager.has_replicas and request.method not in ("GET", "HEAD"):
+        window = settings.read_your_writes_seconds
+        response.set_cookie(
+            PRIMARY_COOKIE, str(time.time() + window), max_age=int(window) or 1
+        )
     async with sessionmanager.session() as session:
         yield session
+
+
+def get_read_db_session_factory(request: Request):
+    """
+    The primary or one replica, picked once per request: FastAPI caches this
+    dependency, so the request's read session and the sessions its response
+    opens later all use the same database.
+    """
+    if _wants_primary(request):
+        return sessionmanager.session
+    return sessionmanager.read_session_factory()
+
+
+async def get_read_db_session(session_factory=Depends(get_read_db_session_factory)):
+    async with session_factory() as session:
+        yield session
+
+
+def get_db_session_factory():
+    """
+    For responses that outlive the request handler (e.g. StreamingResponse),
+    which must open and close their own session.
+    """
+    return sessionmanager.session
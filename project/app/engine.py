@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.batcher import SummaryBatcher
+from app.config import get_settings
+from app.fetcher import ArticleFetcher
+from app.metrics import SUMMARIZER_STARTUP, SUMMARY_QUEUE_DEPTH
+from app.result_writer import ResultWriter
+from app.summarizer import generate_summary, warm_up
+
+log = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class EngineBusyError(Exception):
+    """Raised when the job queue stays full for longer than the submit timeout."""
+
+
+class SummaryEngine:
+    """
+    Runs summary jobs off the event loop.
+
+    Jobs are buffered in a bounded queue and drained by `concurrency` consumer
+    tasks. Each job fetches the article with a shared ArticleFetcher and
+    hands the CPU bound NLP work to a process pool, so the API workers' event
+    loop is never blocked by newspaper/nltk. Articles are summarized in
+    micro-batches of up to `batch_size` (unless it is 1), see app/batcher.py,
+    and saved in batches of up to `write_batch_size`, see
+    app/result_writer.py. `stop` saves the summaries that are still buffered.
+
+    `start` spawns every pool process and loads the NLP resources in it, so
+    the first jobs do not pay for it and missing NLTK data fails startup
+    instead of every job.
+    """
+
+    def __init__(
+        self,
+        processes: int = 2,
+        concurrency: int = 4,
+        queue_size: int = 100,
+        job_timeout: float = 60.0,
+        fetcher: Optional[ArticleFetcher] = None,
+        batch_size: int = 4,
+        batch_max_wait: float = 0.05,
+        write_batch_size: int = 100,
+        write_interval: float = 0.1,
+    ):
+        self._processes = processes
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        self._job_timeout = job_timeout
+        self._fetcher = fetcher or ArticleFetcher()
+        self._batch_size = batch_size
+        self._batch_max_wait = batch_max_wait
+        self._write_batch_size = write_batch_size
+        self._write_interval = write_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumers: list[asyncio.Task] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._batcher: Optional[SummaryBatcher] = None
+        self._writer: Optional[ResultWriter] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._consumers)
+
+    @property
+    def saturated(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            await self._warm_up()
+        except BaseException:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._queue = None
+            raise
+        await self._fetcher.start()
+        self._writer = ResultWriter(self._write_batch_size, self._write_interval)
+        await self._writer.start()
+        # A batch size of 1 summarizes every article on its own, without
+        # waiting for a batch to fill
+        if self._batch_size > 1:
+            self._batcher = SummaryBatcher(
+                self._executor,
+                batch_size=self._batch_size,
+                max_wait=self._batch_max_wait,
+                max_in_flight=self._processes,
+                writer=self._writer,
+            )
+            await self._batcher.start()
+        self._consumers = [
+            asyncio.create_task(self._consume()) for _ in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            SUMMARY_QUEUE_DEPTH.dec()
+            future.cancel()
+
+        if self._batcher is not None:
+            await self._batcher.stop()
+            self._batcher = None
+        if self._writer is not None:
+            await self._writer.stop()
+            self._writer = None
+        await self._fetcher.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+    async def _warm_up(self) -> None:
+        # A spawn pool starts a new process for each call while none is idle,
+        # so `processes` concurrent calls reach every process once
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        loaded = await asyncio.gather(
+            *[
+                loop.run_in_executor(self._executor, warm_up)
+                for _ in range(self._processes)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+        SUMMARIZER_STARTUP.labels("pool").set(elapsed)
+        SUMMARIZER_STARTUP.labels("nlp_resources").set(max(loaded))
+        log.info(
+            "Started %s summarizer processes in %.2fs (NLP resources %.2fs)",
+            self._processes,
+            elapsed,
+            max(loaded),
+        )
+
+    async def submit(
+        self, summary_id: int, url: str, timeout: float = 1.0
+    ) -> asyncio.Future:
+        """
+        Queue a job, waiting up to `timeout` seconds for a free slot.
+        Raises EngineBusyError so callers can shed load instead of piling up.
+        The returned future resolves once the job has finished.
+        """
+        if not self.running:
+            raise Exception("SummaryEngine is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self._queue.put((summary_id, url, future)), timeout)
+        except asyncio.TimeoutError:
+            raise EngineBusyError("Summary queue is full")
+        SUMMARY_QUEUE_DEPTH.inc()
+        return future
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _consume(self) -> None:
+        while True:
+            summary_id, url, future = await self._queue.get()
+            SUMMARY_QUEUE_DEPTH.dec()
+            try:
+                await asyncio.wait_for(
+                    self._process(summary_id, url), self._job_timeout
+                )
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except asyncio.TimeoutError as exc:
+                log.warning(
+                    "Summary job %s timed out after %ss", summary_id, self._job_timeout
+                )
+                future.set_exception(exc)
+            except Exception as exc:
+                log.exception("Summary job %s failed", summary_id)
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, summary_id: int, url: str) -> None:
+        await generate_summary(
+            summary_id,
+            url,
+            self._fetcher,
+            self._executor,
+            batcher=self._batcher,
+            writer=self._writer,
+        )
+
+
+summary_engine = SummaryEngine(
+    processes=settings.summarizer_processes,
+    concurrency=settings.summarizer_concurrency,
+    queue_size=settings.summarizer_queue_size,
+    job_timeout=settings.summarizer_job_timeout,
+    batch_size=settings.summarizer_batch_size,
+    batch_max_wait=settings.summarizer_batch_max_wait,
+    write_batch_size=settings.summary_write_batch_size,
+    write_interval=settings.summary_write_interval,
+    fetcher=ArticleFetcher(
+        connect_timeout=settings.fetch_connect_timeout,
+        read_timeout=settings.summarizer_fetch_timeout,
+        max_connections=settings.fetch_max_connections,
+        per_host_limit=settings.fetch_per_host_limit,
+        max_bytes=settings.fetch_max_bytes,
+        max_redirects=settings.fetch_max_redirects,
+    ),
+)
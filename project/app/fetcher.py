@@ -0,0 +1,140 @@
+"""
+Article fetch stage of the summarizer.
+
+One shared httpx.AsyncClient per process keeps connections alive across
+articles. Requests to a single host are capped so a burst of jobs for one
+site does not hammer it, and every response is checked before newspaper
+ever sees it: HTML content type, size limit (enforced while streaming, not
+only from Content-Length) and a bounded number of redirects.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, NamedTuple, Optional
+
+import httpx
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+class FetchError(Exception):
+    """The URL does not point to an HTML page we are willing to summarize."""
+
+
+class Page(NamedTuple):
+    html: Optional[str]  # None when the page was not modified
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class ArticleFetcher:
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        max_connections: int = 100,
+        per_host_limit: int = 4,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_redirects: int = 5,
+        user_agent: str = "fastapi-summarizer/1.0",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._per_host_limit = per_host_limit
+        self._max_bytes = max_bytes
+        self._max_redirects = max_redirects
+        self._user_agent = user_agent
+        self._transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        # host -> (semaphore, users), dropped when the last user is done
+        self._hosts: dict[str, tuple[asyncio.Semaphore, int]] = {}
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=self._limits,
+                follow_redirects=True,
+                max_redirects=self._max_redirects,
+                headers={"User-Agent": self._user_agent, "Accept": "text/html"},
+                transport=self._transport,
+            )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch_page(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> Page:
+        """
+        Download an HTML page with its validators, raising FetchError or an
+        httpx error. Given the validators of a previous fetch, an unchanged
+        page comes back with `html=None`.
+        """
+        if self._client is None:
+            raise Exception("ArticleFetcher is not started")
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self._host_slot(httpx.URL(url).host):
+            async with self._client.stream("GET", url, headers=headers) as response:
+                validators = (
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                )
+                if response.status_code == 304 and headers:
+                    return Page(
+                        None, validators[0] or etag, validators[1] or last_modified
+                    )
+
+                response.raise_for_status()
+                self._check_headers(response)
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > self._max_bytes:
+                        raise FetchError(
+                            f"{url} is larger than {self._max_bytes} bytes"
+                        )
+
+                html = body.decode(response.encoding or "utf-8", errors="replace")
+                return Page(html, *validators)
+
+    @contextlib.asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        semaphore, users = self._hosts.get(
+            host, (asyncio.Semaphore(self._per_host_limit), 0)
+        )
+        self._hosts[host] = (semaphore, users + 1)
+        try:
+            async with semaphore:
+                yield
+        finally:
+            semaphore, users = self._hosts[host]
+            if users == 1:
+                del self._hosts[host]
+            else:
+                self._hosts[host] = (semaphore, users - 1)
+
+    def _check_headers(self, response: httpx.Response) -> None:
+        content_type = response.headers.get("content-type", "")
+        if content_type.split(";")[0].strip().lower() not in HTML_CONTENT_TYPES:
+            raise FetchError(
+                f"{response.url} is not HTML ({content_type or 'unknown'})"
+            )
+
+        length = response.headers.get("content-length")
+        if length is not None and length.isdigit() and int(length) > self._max_bytes:
+            raise FetchError(f"{response.url} is larger than {self._max_bytes} bytes")
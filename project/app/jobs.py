@@ -0,0 +1,147 @@
+"""
+Durable summary job queue stored in Postgres.
+
+Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of
+worker processes can drain the table concurrently without handing the same
+job out twice. A claimed job carries a lease; if its worker dies the lease
+expires and the job becomes claimable again, or fails once it has used up
+its attempts.
+"""
+
+from datetime import timedelta
+from typing import List, Tuple
+
+from sqlalchemy import CTE, and_, delete, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sqlalchemy import SummaryJob
+
+PENDING = "pending"
+RUNNING = "running"
+FAILED = "failed"
+
+
+async def enqueue_many(
+    summaries: List[Tuple[int, str]], db: AsyncSession, batch_size: int = 1000
+) -> None:
+    """
+    Queue jobs for many `(summary_id, url)` pairs, one multi-row INSERT per
+    `batch_size` jobs. The caller commits.
+    """
+    for start in range(0, len(summaries), batch_size):
+        await db.execute(
+            insert(SummaryJob).values(
+                [
+                    {
+                        "summary_id": summary_id,
+                        "url": url,
+                        "status": PENDING,
+                        "attempts": 0,
+                    }
+                    for summary_id, url in summaries[start : start + batch_size]
+                ]
+            )
+        )
+
+
+def enqueue_from(rows: CTE) -> CTE:
+    """
+    Data-modifying CTE queueing a job for every `(id, url)` row of `rows`,
+    so a job can be created by the same statement that inserts its summary.
+    """
+    return (
+        insert(SummaryJob)
+        .from_select(
+            ["summary_id", "url", "status", "attempts"],
+            select(rows.c.id, rows.c.url, literal(PENDING), literal(0)),
+        )
+        .cte("enqueued")
+    )
+
+
+async def claim(
+    limit: int, lease_seconds: int, max_attempts: int, db: AsyncSession
+) -> List[SummaryJob]:
+    now = func.now()
+    # Jobs whose worker died on their last attempt
+    exhausted = (
+        select(SummaryJob.id)
+        .where(
+            SummaryJob.status == RUNNING,
+            SummaryJob.lease_expires_at < now,
+            SummaryJob.attempts >= max_attempts,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    await db.execute(
+        update(SummaryJob)
+        .where(SummaryJob.id.in_(exhausted.scalar_subquery()))
+        .values(status=FAILED, lease_expires_at=None, last_error="Lease expired")
+        .execution_options(synchronize_session=False)
+    )
+
+    claimable = (
+        select(SummaryJob.id)
+        .where(
+            or_(
+                and_(SummaryJob.status == PENDING, SummaryJob.run_at <= now),
+                and_(
+                    SummaryJob.status == RUNNING,
+                    SummaryJob.lease_expires_at < now,
+                    SummaryJob.attempts < max_attempts,
+                ),
+            )
+        )
+        .order_by(SummaryJob.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(SummaryJob)
+        .where(SummaryJob.id.in_(claimable.scalar_subquery()))
+        .values(
+            status=RUNNING,
+            attempts=SummaryJob.attempts + 1,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+        )
+        .returning(SummaryJob)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    jobs = result.scalars().all()
+    await db.commit()
+    return jobs
+
+
+async def complete(job_id: int, db: AsyncSession) -> None:
+    await db.execute(delete(SummaryJob).where(SummaryJob.id == job_id))
+    await db.commit()
+
+
+def backoff(attempts: int, base: float, maximum: float) -> float:
+    """Exponential backoff in seconds before retry number `attempts`."""
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+async def fail(
+    job: SummaryJob,
+    error: str,
+    max_attempts: int,
+    backoff_base: float,
+    backoff_max: float,
+    db: AsyncSession,
+) -> None:
+    if job.attempts >= max_attempts:
+        values = {"status": FAILED, "lease_expires_at": None}
+    else:
+        delay = backoff(job.attempts, backoff_base, backoff_max)
+        values = {
+            "status": PENDING,
+            "lease_expires_at": None,
+            "run_at": func.now() + timedelta(seconds=delay),
+        }
+    await db.execute(
+        update(SummaryJob)
+        .where(SummaryJob.id == job.id)
+        .values(last_error=error[:1000], **values)
+    )
+    await db.commit()
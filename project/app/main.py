@@ -3,16 +3,22 @@ import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from app.api import ping, summaries
+from app import metrics, profiling
+from app.api import cache, ping, pool, summaries
+from app.api import metrics as metrics_api
+from app.cache import summary_cache
 from app.config import get_settings
 from app.db import sessionmanager
+from app.notifications import summary_notifier
 
 settings = get_settings()
 logging.basicConfig(
     stream=sys.stdout,
     level=logging.DEBUG if settings.log_level == "DEBUG" else logging.INFO,
 )
+log = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -21,22 +27,61 @@ async def lifespan(app: FastAPI):
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
+    if summary_cache.backend == "memory":
+        # The worker rewrites summaries in another process: listen for its
+        # notifications to drop them from this process's cache
+        try:
+            await summary_notifier.start()
+        except Exception:
+            log.warning(
+                "Summary notifications unavailable, cached summaries may be "
+                "stale for up to %ss",
+                summary_cache.ttl,
+                exc_info=True,
+            )
     yield
+    await summary_notifier.stop()
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
 
 
+def default_response_class(name: str) -> type[JSONResponse]:
+    """Response class of routes returning plain data: "json" or "orjson"."""
+    if name == "orjson":
+        # Optional dependency, only needed when orjson responses are enabled
+        import orjson  # noqa: F401
+
+        return ORJSONResponse
+    if name == "json":
+        return JSONResponse
+    raise ValueError(f"Unknown JSON response {name!r}, expected 'json' or 'orjson'")
+
+
 def create_application() -> FastAPI:
     application = FastAPI(
         lifespan=lifespan,
         title=settings.project_name,
+        default_response_class=default_response_class(settings.json_response),
     )
 
     application.include_router(ping.router)
     application.include_router(
         summaries.router, prefix="/summaries", tags=["summaries"]
     )
+    application.include_router(cache.router, prefix="/cache", tags=["cache"])
+    application.include_router(pool.router, prefix="/pool", tags=["pool"])
+    application.include_router(metrics_api.router)
+
+    application.add_middleware(metrics.MetricsMiddleware)
+    application.add_middleware(
+        profiling.ProfilingMiddleware,
+        sample_rate=settings.profiling_sample_rate,
+        token=settings.profiling_token,
+        directory=settings.profiling_dir,
+    )
+    metrics.instrument_queries()
+    profiling.log_slow_queries(settings.slow_query_threshold)
 
     return application
 
@@ -0,0 +1,145 @@
+"""
+Prometheus metrics.
+
+Request latency per route template, requests in flight, SQL query timing and
+summary job metrics. Under gunicorn every worker process keeps its own
+values; set PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the
+workers (see gunicorn.conf.py) and `/metrics` aggregates all of them.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement type",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+SUMMARY_JOB_LATENCY = Histogram(
+    "summary_job_duration_seconds",
+    "Time to fetch and summarize an article",
+    ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+SUMMARY_QUEUE_DEPTH = Gauge(
+    "summary_queue_depth",
+    "Summary jobs waiting in the engine queue",
+    multiprocess_mode="livesum",
+)
+SUMMARY_JOBS_IN_PROGRESS = Gauge(
+    "summary_jobs_in_progress",
+    "Summary jobs claimed by a worker and not finished yet",
+    multiprocess_mode="livesum",
+)
+SUMMARIZER_STARTUP = Gauge(
+    "summarizer_startup_seconds",
+    "Time to start the summarizer process pool and load NLP resources in it",
+    ["stage"],
+    multiprocess_mode="max",
+)
+SUMMARIZER_BATCH_FILL = Histogram(
+    "summarizer_batch_fill_ratio",
+    "Articles per summarizer batch, as a share of the batch size",
+    buckets=(0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0),
+)
+SUMMARY_WRITE_BATCH = Histogram(
+    "summary_write_batch_size",
+    "Summaries saved per write-back statement",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request. Routes are labelled with their template
+    (`/summaries/{id}/`), never the raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method, getattr(route, "path", UNMATCHED_ROUTE), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # A connection runs one statement at a time; a failed statement's start
+    # time is simply overwritten by the next one
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    QUERY_LATENCY.labels(operation).observe(time.perf_counter() - started)
+
+
+def instrument_queries() -> None:
+    """Time the SQL statements of every engine in this process."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def registry() -> CollectorRegistry:
+    """The registry to expose: every process' values in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return merged
+    return REGISTRY
+
+
+def collect() -> bytes:
+    return generate_latest(registry())
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, AnyHttpUrl
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import Literal, Optional
+
+from typing_extensions import TypedDict  # pydantic needs it before Python 3.12
 
 
 class SummaryPayloadSchema(BaseModel):
@@ -11,15 +14,50 @@ class SummaryResponseSchema(SummaryPayloadSchema):
 
 
 class SummarySchema(BaseModel):
+    # Validates SQLAlchemy models and rows by attribute
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     url: str
     summary: str
     created_at: datetime
 
-    class Config:
-        orm_mode = True  # This allows Pydantic to work with SQLAlchemy models
+
+class SummaryRecordSchema(SummarySchema):
+    """SummarySchema plus the version used for conditional requests."""
+
+    updated_at: Optional[datetime] = None
 
 
 class SummaryUpdatePayloadSchema(BaseModel):
     url: AnyHttpUrl
     summary: str
+
+
+SummaryField = Literal["id", "url", "summary", "created_at", "updated_at", "status"]
+
+
+class SummaryRow(TypedDict, total=False):
+    """
+    A summary listing entry, serialized straight from selected columns without
+    building a model per row. Only the requested fields are present.
+    """
+
+    id: int
+    url: str
+    summary: str
+    created_at: datetime
+    updated_at: datetime
+    status: Literal["pending", "complete"]
+
+
+class SummaryFilterSchema(BaseModel):
+    """Query parameters filtering and ordering summary listings."""
+
+    url_prefix: Optional[str] = Field(None, description="URLs starting with this")
+    domain: Optional[str] = Field(None, description="Exact host, e.g. example.com")
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    status: Optional[Literal["pending", "complete"]] = None
+    q: Optional[str] = Field(None, description="Full-text search in the summaries")
+    sort: Literal["id", "-id", "created_at", "-created_at"] = "id"
@@ -1,20 +1,129 @@
 # project/app/models/sqlalchemy.py
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    literal_column,
+    text,
+)
 from sqlalchemy.orm import declarative_base
 
 # Define the base class for declarative class definitions
 Base = declarative_base()
 
 
+# Text search configuration of the summary search index. A literal rather than
+# a bound parameter, so queries match the index expression.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
 class TextSummary(Base):
     __tablename__ = "text_summary"  # Define the table name
+    __table_args__ = (
+        Index("ix_text_summary_created_at_id", "created_at", "id"),
+        Index(
+            "ix_text_summary_url_pattern",
+            "url",
+            postgresql_ops={"url": "text_pattern_ops"},
+        ),
+        Index("ix_text_summary_pending", "id", postgresql_where=text("summary = ''")),
+        Index(
+            "ix_text_summary_summary_search",
+            text("to_tsvector('english'::regconfig, summary)"),
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)  # Add a primary key
     url = Column(String, nullable=False)
+    # Canonical URL, see app.urls.normalize_url; NULL for legacy duplicates
+    normalized_url = Column(String, nullable=True, unique=True, index=True)
     summary = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    summarized_at = Column(DateTime, nullable=True)
+    # Host part of normalized_url, maintained by Postgres
+    domain = Column(
+        String,
+        Computed(r"substring(normalized_url from '^[a-z]+://([^/:?#]+)')"),
+        index=True,
+    )
+    # Bumped on every change, used for ETag / Last-Modified
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     def __str__(self):
         return self.url
+
+
+def summary_search_vector(summary):
+    """The indexed expression of ix_text_summary_summary_search."""
+    return func.to_tsvector(SEARCH_CONFIG, summary)
+
+
+class SummaryJob(Base):
+    __tablename__ = "summary_job"
+    __table_args__ = (Index("ix_summary_job_status_run_at", "status", "run_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    summary_id = Column(
+        Integer,
+        ForeignKey("text_summary.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    url = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending/running/failed
+    attempts = Column(Integer, nullable=False, default=0)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __str__(self):
+        return f"{self.summary_id}: {self.url} ({self.status})"
+
+
+class FetchedPage(Base):
+    """Last fetched HTML of a URL with its HTTP validators, see app.content_cache."""
+
+    __tablename__ = "fetched_page"
+
+    url = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    # sha256 of the extracted title and text
+    content_hash = Column(String(64), nullable=False)
+    html = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    fetched_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    accessed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
+
+
+class ContentSummary(Base):
+    """Summary of an extracted article text, shared by every URL serving it."""
+
+    __tablename__ = "content_summary"
+
+    content_hash = Column(String(64), primary_key=True)
+    summary = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    accessed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
@@ -0,0 +1,133 @@
+"""
+Summary completion notifications over Postgres LISTEN/NOTIFY.
+
+Writers notify from the statement that changes the summary, so the
+notification is delivered on commit. Each API process keeps a single
+listening connection and fans notifications out to any number of
+in-process waiters, and to `on_update`, which drops the summary from the
+process's own read-through cache.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Optional
+
+import asyncpg
+from sqlalchemy import String, cast, func
+from sqlalchemy.engine import make_url
+
+from app.cache import summary_cache, summary_key
+from app.db import DATABASE_URL
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "summary_updated"
+
+
+def summary_updated_notification(id_column):
+    """
+    `pg_notify` as a column expression, to notify from the RETURNING clause
+    of the statement that changes the summary instead of a second query.
+    """
+    return func.pg_notify(CHANNEL, cast(id_column, String))
+
+
+class SummaryNotifier:
+    def __init__(
+        self,
+        url: str,
+        channel: str = CHANNEL,
+        on_update: Optional[Callable[[Optional[int]], None]] = None,
+    ):
+        # asyncpg wants a plain postgresql:// DSN, not the SQLAlchemy one
+        self._dsn = (
+            make_url(str(url))
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._channel = channel
+        # Called with the id of every updated summary, or None when
+        # notifications may have been missed
+        self._on_update = on_update
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._waiters: defaultdict[int, set[asyncio.Event]] = defaultdict(set)
+
+    async def start(self) -> None:
+        """Open the listening connection, if it is not open already."""
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+
+            connection = await asyncpg.connect(self._dsn)
+            connection.add_termination_listener(self._on_terminate)
+            await connection.add_listener(self._channel, self._on_notify)
+            self._connection = connection
+
+    async def stop(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                await self._connection.close()
+                self._connection = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, summary_id: int) -> AsyncIterator[asyncio.Event]:
+        """
+        Yields an event that is set when the summary changes. Subscribe before
+        reading the current state, so an update in between is not missed.
+        """
+        await self.start()
+        event = asyncio.Event()
+        self._waiters[summary_id].add(event)
+        try:
+            yield event
+        finally:
+            waiters = self._waiters.get(summary_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[summary_id]
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            summary_id = int(payload)
+        except ValueError:
+            return
+        if self._on_update is not None:
+            self._on_update(summary_id)
+        for event in self._waiters.get(summary_id, ()):
+            event.set()
+
+    def _on_terminate(self, connection) -> None:
+        log.warning("Notification listener connection lost")
+        self._connection = None
+        # Notifications may have been missed, let every waiter re-check
+        if self._on_update is not None:
+            self._on_update(None)
+        for waiters in self._waiters.values():
+            for event in waiters:
+                event.set()
+
+
+def forget_cached_summary(summary_id: Optional[int]) -> None:
+    """
+    Summaries are also rewritten by the worker process, which can't reach an
+    API process's in-memory cache: drop the entry when it is notified.
+    """
+    if summary_id is None:
+        summary_cache.forget_all()
+    else:
+        summary_cache.forget(summary_key(summary_id))
+
+
+summary_notifier = SummaryNotifier(DATABASE_URL, on_update=forget_cached_summary)
+
+
+def get_summary_notifier() -> SummaryNotifier:
+    return summary_notifier
@@ -0,0 +1,179 @@
+"""
+Opt-in request profiling and a slow query log.
+
+A request is profiled with cProfile when it is sampled (`profiling_sample_rate`)
+or sends `X-Profile: <profiling_token>`. The profile is written to
+`profiling_dir` as `<id>.prof` (open it with `python -m pstats` or snakeviz),
+its top functions are logged, and a triggered response carries the id in
+`X-Profile-Id`. cProfile sees the whole thread, so work of concurrent requests
+on the same event loop shows up too; only one request is profiled at a time.
+
+Statements slower than `slow_query_threshold` seconds are logged with the
+route of the request that issued them.
+"""
+
+import contextvars
+import cProfile
+import hashlib
+import io
+import logging
+import os
+import pstats
+import random
+import secrets
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# ASGI scope of the request being served, for log context
+current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "current_scope", default=None
+)
+
+
+def current_route() -> Optional[str]:
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        sample_rate: float = 0.0,
+        token: Optional[str] = None,
+        directory: Optional[str] = None,
+        top: int = 25,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token
+        self.directory = directory
+        self.top = top
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reset = current_scope.set(scope)
+        try:
+            if self._profiling or not self._wants_profile(scope):
+                await self.app(scope, receive, send)
+            else:
+                await self._profile(scope, receive, send)
+        finally:
+            current_scope.reset(reset)
+
+    def _wants_profile(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.token is None:
+            return False
+        header = dict(scope["headers"]).get(PROFILE_HEADER)
+        return header is not None and secrets.compare_digest(
+            header, self.token.encode()
+        )
+
+    async def _profile(self, scope, receive, send):
+        profile_id = f"{int(time.time())}-{secrets.token_hex(4)}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._profiling = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            self._report(profile_id, profiler, time.perf_counter() - started)
+
+    def _report(self, profile_id: str, profiler: cProfile.Profile, elapsed: float):
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        log.info(
+            "Profile %s of %s (%.1fms):\n%s",
+            profile_id,
+            current_route(),
+            elapsed * 1000,
+            output.getvalue(),
+        )
+
+
+def fingerprint(parameters) -> str:
+    """Stable short hash of query parameters: groups repeats, hides values."""
+    return hashlib.sha1(repr(parameters).encode()).hexdigest()[:12]
+
+
+class SlowQueryLog:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+
+    def before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    def after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        started = conn.info.pop("slow_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration >= self.threshold:
+            log.warning(
+                "Slow query (%.1fms) from %s, params %s: %s",
+                duration * 1000,
+                current_route() or "-",
+                fingerprint(parameters),
+                statement[:1000],
+            )
+
+
+_slow_query_log: Optional[SlowQueryLog] = None
+
+
+def log_slow_queries(threshold: Optional[float]) -> None:
+    """Log statements slower than `threshold` seconds on every engine; None stops."""
+    global _slow_query_log
+    if _slow_query_log is not None:
+        event.remove(
+            Engine, "before_cursor_execute", _slow_query_log.before_cursor_execute
+        )
+        event.remove(
+            Engine, "after_cursor_execute", _slow_query_log.after_cursor_execute
+        )
+        _slow_query_log = None
+
+    if threshold is not None:
+        _slow_query_log = SlowQueryLog(threshold)
+        event.listen(
+            Engine, "before_cursor_execute", _slow_query_log.before_cursor_execute
+        )
+        event.listen(
+            Engine, "after_cursor_execute", _slow_query_log.after_cursor_execute
+        )
@@ -0,0 +1,82 @@
+"""
+Batched write-back of finished summaries.
+
+Jobs hand their summaries to a ResultWriter, which saves everything written
+since the last flush with one `save_summaries` statement, every
+`flush_interval` seconds or as soon as `batch_size` summaries are waiting.
+`write` returns only once its summaries are committed, so a job is never
+marked complete before its summary is saved: if the process dies first, the
+job's lease expires and it runs again (at-least-once). `stop` flushes what
+is left.
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from app import summarizer
+from app.metrics import SUMMARY_WRITE_BATCH
+
+
+class ResultWriter:
+    def __init__(self, batch_size: int = 100, flush_interval: float = 0.1):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._summaries: List[Tuple[int, str]] = []
+        self._waiters: List[asyncio.Future] = []
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._stopping = False
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._flusher is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._flusher
+        self._flusher = None
+        await self.flush()
+
+    async def write(self, summaries: List[Tuple[int, str]]) -> None:
+        """Save `(summary id, text)` pairs with the next flush, waiting for it."""
+        if self._flusher is None:
+            raise Exception("ResultWriter is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        self._summaries += summaries
+        self._waiters.append(future)
+        if len(self._summaries) >= self.batch_size:
+            self._wake.set()
+        await future
+
+    async def flush(self) -> None:
+        if not self._summaries:
+            return
+        summaries, self._summaries = self._summaries, []
+        waiters, self._waiters = self._waiters, []
+        SUMMARY_WRITE_BATCH.observe(len(summaries))
+        try:
+            await summarizer.save_summaries(summaries)
+        except Exception as exc:
+            # The jobs fail and are retried
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
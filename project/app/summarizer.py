@@ -1,34 +1,188 @@
 import asyncio
 import logging
+import time
+from datetime import datetime
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import nltk
-from newspaper import Article
-from sqlalchemy import select
+from sqlalchemy import Integer, Text, column, update, values
 
+from app.cache import summary_cache, summary_key
+from app.config import get_settings
+from app.content_cache import content_cache, content_hash
 from app.db import sessionmanager  # Import your session manager
+from app.fetcher import ArticleFetcher
 from app.models.sqlalchemy import TextSummary
+from app.notifications import summary_updated_notification
 
+if TYPE_CHECKING:
+    from newspaper import Config
+    from nltk.tokenize.punkt import PunktTokenizer
 
-async def generate_summary(summary_id: int, url: str) -> None:
-    article = Article(url)
-    article.download()
-    article.parse()
+    from app.batcher import SummaryBatcher
+    from app.result_writer import ResultWriter
+    from app.summarizer_backends import SummarizerBackend
+
+log = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class SummarizerResourceError(Exception):
+    """NLTK data the summarizer needs is not installed."""
+
+
+# newspaper and nltk (with lxml, PIL, ...) are imported by the functions
+# below, so only the summarizer processes pay for them, not the API or the
+# worker's event loop process. Loaded once per process by warm_up():
+_config: Optional["Config"] = None
+_tokenizer: Optional["PunktTokenizer"] = None
+_backend: Optional["SummarizerBackend"] = None
+_warm_up_seconds = 0.0
+
+
+def warm_up() -> float:
+    """
+    Import newspaper/nltk, load the punkt sentence tokenizer, newspaper's
+    config and NLP stopwords and create the `summarizer_backend` in this
+    process, keeping them for every later article. Nothing is downloaded:
+    missing NLTK data raises SummarizerResourceError (install it with
+    `python -m nltk.downloader punkt_tab`). Returns the seconds the first
+    call took.
+    """
+    global _config, _tokenizer, _backend, _warm_up_seconds
+    if _tokenizer is not None:
+        return _warm_up_seconds
+
+    started = time.perf_counter()
+    from newspaper import Config, nlp
+    from nltk.tokenize.punkt import PunktTokenizer
+
+    from app.summarizer_backends import create_backend
 
     try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        nltk.download("punkt_tab")
-    finally:
-        article.nlp()
+        tokenizer = PunktTokenizer("english")
+    except LookupError as exc:
+        raise SummarizerResourceError(
+            "NLTK punkt_tab tokenizer is not installed, "
+            "run `python -m nltk.downloader punkt_tab`"
+        ) from exc
+
+    config = Config()
+    nlp.load_stopwords(config.get_language())
+    backend = create_backend(settings.summarizer_backend)
+    # newspaper rebuilds the tokenizer from disk for every article otherwise
+    nlp.split_sentences = _split_sentences
+
+    _config, _tokenizer, _backend = config, tokenizer, backend
+    _warm_up_seconds = time.perf_counter() - started
+    return _warm_up_seconds
+
 
-    summary_text = article.summary
+def _split_sentences(text: str) -> List[str]:
+    """newspaper.nlp.split_sentences with the tokenizer loaded by warm_up()."""
+    sentences = _tokenizer.tokenize(text)
+    return [x.replace("\n", "") for x in sentences if len(x) > 10]
+
+
+def extract_article(url: str, html: str) -> Tuple[str, str]:
+    """Title and main text of already downloaded HTML. CPU bound."""
+    from newspaper import Article
+
+    article = Article(url, config=_config)
+    article.set_html(html)
+    article.parse()
+    return article.title, article.text
 
+
+def summarize_text(title: str, text: str) -> str:
+    """
+    Summarize an extracted article with the configured backend.
+    CPU bound, so it is executed in the engine's process pool.
+    """
+    warm_up()
+    return "\n".join(_backend.summarize(title, text, _config.MAX_SUMMARY_SENT))
+
+
+def summarize_batch(articles: List[Tuple[str, str]]) -> List[str]:
+    """summarize_text for a batch of (title, text), scored together."""
+    warm_up()
+    summaries = _backend.summarize_many(articles, _config.MAX_SUMMARY_SENT)
+    return ["\n".join(summary) for summary in summaries]
+
+
+def summarize_html(url: str, html: str) -> str:
+    return summarize_text(*extract_article(url, html))
+
+
+async def save_summaries(summaries: List[Tuple[int, str]]) -> None:
+    """
+    Save a batch of (summary id, text) in a single UPDATE ... FROM (VALUES ...),
+    notifying from its RETURNING clause.
+    """
+    rows = values(column("id", Integer), column("summary", Text), name="batch").data(
+        list(dict(summaries).items())
+    )
     async with sessionmanager.session() as db:
         result = await db.execute(
-            select(TextSummary).where(TextSummary.id == summary_id)
+            update(TextSummary)
+            .where(TextSummary.id == rows.c.id)
+            .values(summary=rows.c.summary, summarized_at=datetime.utcnow())
+            .returning(TextSummary.id, summary_updated_notification(TextSummary.id))
+            .execution_options(synchronize_session=False)
         )
-        summary = result.scalars().first()
-        if summary:
-            summary.summary = summary_text
-            await db.commit()
-            await db.refresh(summary)
+        saved = result.scalars().all()
+        await db.commit()
+    for summary_id in saved:
+        await summary_cache.delete(summary_key(summary_id))
+
+
+async def generate_summary(
+    summary_id: int,
+    url: str,
+    fetcher: ArticleFetcher,
+    executor: Executor,
+    batcher: Optional["SummaryBatcher"] = None,
+    writer: Optional["ResultWriter"] = None,
+) -> None:
+    """
+    Fetch, extract and summarize an article, reusing the content cache: an
+    unchanged page is not downloaded again and a known text is not summarized
+    again. With a `batcher`, new texts are summarized in batches; with a
+    `writer`, summaries are saved in batches.
+    """
+    loop = asyncio.get_running_loop()
+
+    async with sessionmanager.session() as db:
+        cached = await content_cache.get_page(url, db)
+
+    article = None
+    if cached is None:
+        page = await fetcher.fetch_page(url)
+    else:
+        page = await fetcher.fetch_page(url, cached.etag, cached.last_modified)
+
+    if page.html is None:
+        html, digest = cached.html, cached.content_hash
+    else:
+        html = page.html
+        article = await loop.run_in_executor(executor, extract_article, url, html)
+        digest = content_hash(*article)
+        async with sessionmanager.session() as db:
+            await content_cache.store_page(url, page, digest, db)
+
+    async with sessionmanager.session() as db:
+        summary_text = await content_cache.get_summary(digest, db)
+
+    if summary_text is None:
+        if article is None:
+            article = await loop.run_in_executor(executor, extract_article, url, html)
+        if batcher is not None:
+            await batcher.summarize(summary_id, digest, article)
+            return
+        summary_text = await loop.run_in_executor(executor, summarize_text, *article)
+        async with sessionmanager.session() as db:
+            await content_cache.store_summary(digest, summary_text, db)
+
+    save = writer.write if writer is not None else save_summaries
+    await save([(summary_id, summary_text)])
@@ -0,0 +1,248 @@
+"""
+Extractive summarizer backends, selected with `summarizer_backend`.
+
+Both score every sentence of an article on the features of newspaper's
+`nlp.summarize` (title words, keyword frequency and density, sentence length
+and position) and return the best `max_sents` sentences in article order.
+"newspaper" is newspaper's own implementation, which loops over every word
+of every sentence in Python. "numpy" computes the same features for all
+sentences at once from a sparse term matrix (flat token ids plus the
+sentence of each token): the summaries are the same. Per article it takes
+about the same CPU time as newspaper on the fixture articles and 1.2-1.3x
+less on long ones, where numpy's per-call overhead matters less; scored as
+one batch it takes 1.3-1.5x less. `python -m benchmarks backends` (with the
+punkt_tab data installed) measures both.
+
+Sentence splitting and the stopword list are loaded once per process by
+`app.summarizer.warm_up`, which creates the backend afterwards.
+"""
+
+import itertools
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+from newspaper import nlp
+
+# Sentence length with the best length score
+IDEAL_LENGTH = 20.0
+NUM_KEYWORDS = 10
+
+NON_WORD = re.compile(r"[^\w ]")
+
+# nlp.sentence_position as steps: a relative position in
+# (POSITION_BOUNDS[i - 1], POSITION_BOUNDS[i]] scores POSITION_SCORES[i]
+POSITION_BOUNDS = np.array([0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+POSITION_SCORES = np.array(
+    [0.0, 0.17, 0.23, 0.14, 0.08, 0.05, 0.04, 0.06, 0.04, 0.04, 0.15, 0.0]
+)
+
+
+class SummarizerBackend:
+    name = "base"
+
+    def summarize(self, title: str, text: str, max_sents: int) -> List[str]:
+        """The `max_sents` most important sentences of `text`, in order."""
+        raise NotImplementedError
+
+    def summarize_many(
+        self, articles: List[Tuple[str, str]], max_sents: int
+    ) -> List[List[str]]:
+        """`summarize` for each (title, text) of a batch."""
+        return [self.summarize(title, text, max_sents) for title, text in articles]
+
+
+class NewspaperSummarizer(SummarizerBackend):
+    name = "newspaper"
+
+    def summarize(self, title: str, text: str, max_sents: int) -> List[str]:
+        return nlp.summarize(title=title, text=text, max_sents=max_sents)
+
+
+class NumpySummarizer(SummarizerBackend):
+    """
+    Scores a whole batch of articles at once: one term matrix and one pass
+    of every feature over the sentences of all articles, so numpy's per-call
+    overhead is paid once per batch. The vocabulary and its stopword mask
+    are kept across batches, so each word is looked up only once.
+    """
+
+    name = "numpy"
+
+    def __init__(self, max_vocabulary: int = 500_000):
+        self.max_vocabulary = max_vocabulary
+        self._reset_vocabulary()
+
+    def _reset_vocabulary(self) -> None:
+        self._vocabulary: Dict[str, int] = defaultdict(itertools.count().__next__)
+        self._words: List[str] = []
+        self._stopword = np.zeros(0, bool)
+
+    def summarize(self, title: str, text: str, max_sents: int) -> List[str]:
+        return self.summarize_many([(title, text)], max_sents)[0]
+
+    def summarize_many(
+        self, articles: List[Tuple[str, str]], max_sents: int
+    ) -> List[List[str]]:
+        if len(self._vocabulary) > self.max_vocabulary:
+            self._reset_vocabulary()
+        vocabulary = self._vocabulary
+        sentences: List[str] = []
+        words: List[List[str]] = []
+        sentence_counts, text_ids, title_ids = [], [], []
+        for title, text in articles:
+            if text and title and max_sents > 0:
+                article_sentences = nlp.split_sentences(text)
+            else:
+                article_sentences = []
+            sentences += article_sentences
+            words += [split_words(sentence) for sentence in article_sentences]
+            sentence_counts.append(len(article_sentences))
+            if not article_sentences:
+                text, title = "", ""
+            text_ids.append(self._ids(split_words(text), vocabulary))
+            title_ids.append(self._ids(split_words(title), vocabulary))
+
+        summaries: List[List[str]] = [[] for _ in articles]
+        if not sentences:
+            return summaries
+
+        # Sparse term matrix: the word id and the sentence of every token
+        ids = self._ids(list(itertools.chain.from_iterable(words)), vocabulary)
+        size = len(vocabulary)
+        stopword = self._update_stopwords()
+        counts = np.array(sentence_counts)
+        article_of = np.repeat(np.arange(len(articles)), counts)
+        index = np.arange(len(sentences)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        lengths = np.array([len(w) for w in words])
+        sentence_of = np.repeat(np.arange(len(sentences)), lengths)
+        position = np.arange(len(ids)) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        # Words are only compared within their article
+        keys = article_of[sentence_of] * size + ids
+
+        keyword = self._keyword_scores(keys, text_ids, stopword)
+        frequency = (
+            self._sbs(keyword, sentence_of, lengths)
+            + self._dbs(keyword, keys, sentence_of, position, len(sentences), size)
+        ) / 2.0
+        title_score = self._title_score(
+            keys, title_ids, stopword, sentence_of, article_of
+        )
+        length_score = 1 - np.abs(IDEAL_LENGTH - lengths) / IDEAL_LENGTH
+        position_score = POSITION_SCORES[
+            np.searchsorted(POSITION_BOUNDS, (index + 1) / counts[article_of])
+        ]
+        score = (
+            title_score * 1.5 + frequency * 10.0 * 2.0 + length_score + position_score
+        ) / 4.0
+
+        # Best `max_sents` of each article, ties in article order
+        order = np.lexsort((index, -score, article_of))
+        rank = np.arange(len(order)) - self._group_start(article_of[order])
+        for i in np.sort(order[rank < max_sents]):
+            summaries[article_of[i]].append(sentences[i])
+        return summaries
+
+    def _ids(self, words: List[str], vocabulary: Dict[str, int]) -> np.ndarray:
+        """Ids of `words`, adding new ones to `vocabulary`."""
+        return np.fromiter(map(vocabulary.__getitem__, words), np.intp, len(words))
+
+    def _update_stopwords(self) -> np.ndarray:
+        """Stopword mask of the vocabulary, extended with the words added since."""
+        new = list(itertools.islice(self._vocabulary, len(self._words), None))
+        if new:
+            self._words += new
+            self._stopword = np.concatenate(
+                [self._stopword, np.fromiter((w in nlp.stopwords for w in new), bool)]
+            )
+        return self._stopword
+
+    def _group_start(self, groups: np.ndarray) -> np.ndarray:
+        """For each item of sorted `groups`, the index of its group's first item."""
+        return np.searchsorted(groups, groups)
+
+    def _keyword_scores(self, keys, text_ids, stopword) -> np.ndarray:
+        """Score of each token, 0 unless it is one of its article's keywords."""
+        size = len(stopword)
+        text_lengths = np.array([len(ids) for ids in text_ids])
+        article = np.repeat(np.arange(len(text_ids)), text_lengths)
+        ids = np.concatenate(text_ids)
+        counted = ~stopword[ids]
+        candidates, frequency = np.unique(
+            article[counted] * size + ids[counted], return_counts=True
+        )
+
+        # The most frequent, ties by the word in reverse order: the last ones
+        # of each article sorted by frequency and word
+        by_article = candidates // size
+        words = np.array(
+            list(map(self._words.__getitem__, (candidates % size).tolist())), str
+        )
+        order = np.lexsort((words, frequency, by_article))
+        group_end = np.searchsorted(by_article[order], by_article[order], "right")
+        top = np.sort(order[group_end - np.arange(len(order)) <= NUM_KEYWORDS])
+        top_keys = candidates[top]
+        top_scores = frequency[top] / text_lengths[by_article[top]] * 1.5 + 1
+
+        scores = np.zeros(len(keys))
+        if len(top_keys):
+            found = np.searchsorted(top_keys, keys).clip(max=len(top_keys) - 1)
+            is_keyword = top_keys[found] == keys
+            scores[is_keyword] = top_scores[found[is_keyword]]
+        return scores
+
+    def _sbs(self, keyword, sentence_of, lengths) -> np.ndarray:
+        """Summation based selection: mean keyword score of the sentence."""
+        total = np.bincount(sentence_of, weights=keyword, minlength=len(lengths))
+        return np.divide(
+            total, lengths * 10.0, out=np.zeros(len(lengths)), where=lengths > 0
+        )
+
+    def _dbs(self, keyword, keys, sentence_of, position, count, size) -> np.ndarray:
+        """Density based selection: keyword pairs weighted by their distance."""
+        is_keyword = keyword > 0
+        score, sentence = keyword[is_keyword], sentence_of[is_keyword]
+        where = position[is_keyword]
+
+        # Consecutive keywords of the same sentence
+        pair = np.flatnonzero(sentence[1:] == sentence[:-1]) + 1
+        weights = score[pair] * score[pair - 1] / (where[pair] - where[pair - 1]) ** 2.0
+        total = np.bincount(sentence[pair], weights=weights, minlength=count)
+
+        # Distinct keywords per sentence
+        distinct = np.unique(sentence * size + keys[is_keyword] % size)
+        k = np.bincount(distinct // size, minlength=count) + 1
+        return total / (k * (k + 1.0))
+
+    def _title_score(self, keys, title_ids, stopword, sentence_of, article_of):
+        """Share of the title's words the sentence contains."""
+        size = len(stopword)
+        article = np.repeat(np.arange(len(title_ids)), [len(ids) for ids in title_ids])
+        ids = np.concatenate(title_ids)
+        counted = ~stopword[ids]
+        in_title = np.isin(keys, article[counted] * size + ids[counted])
+        matches = np.bincount(sentence_of, weights=in_title, minlength=len(article_of))
+        words = np.bincount(article[counted], minlength=len(title_ids))
+        return matches / np.maximum(words, 1)[article_of]
+
+
+def split_words(text: str) -> List[str]:
+    """nlp.split_words, lowercasing the whole string instead of every word."""
+    # Removing the non-word characters also removes the dots it strips
+    return NON_WORD.sub("", text).lower().split()
+
+
+BACKENDS = {backend.name: backend for backend in (NewspaperSummarizer, NumpySummarizer)}
+
+
+def create_backend(name: str) -> SummarizerBackend:
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown summarizer backend {name!r}, expected one of {sorted(BACKENDS)}"
+        )
+    return BACKENDS[name]()
@@ -0,0 +1,171 @@
+"""
+Standalone summary worker.
+
+Drains the durable `summary_job` table and runs the jobs on a SummaryEngine.
+Run it with `python -m app.worker`; scale it independently of the API.
+"""
+
+import asyncio
+import logging
+import signal
+import sys
+import time
+
+from prometheus_client import start_http_server
+
+from app import jobs
+from app.config import get_settings
+from app.db import DatabaseSessionManager, sessionmanager
+from app.engine import SummaryEngine, summary_engine
+from app.metrics import (
+    SUMMARY_JOB_LATENCY,
+    SUMMARY_JOBS_IN_PROGRESS,
+    instrument_queries,
+    registry,
+)
+from app.models.sqlalchemy import SummaryJob
+from app.profiling import log_slow_queries
+
+log = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class Worker:
+    def __init__(
+        self,
+        sessionmanager: DatabaseSessionManager,
+        engine: SummaryEngine,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        lease_seconds: int = 300,
+        max_attempts: int = 5,
+        backoff_base: float = 10.0,
+        backoff_max: float = 3600.0,
+    ):
+        self._sessionmanager = sessionmanager
+        self._engine = engine
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._in_flight: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        await self._engine.start()
+        log.info("Summary worker started with concurrency %s", self._concurrency)
+        try:
+            while not self._stopping.is_set():
+                if len(self._in_flight) >= self._concurrency:
+                    await asyncio.wait(
+                        self._in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    continue
+
+                if not await self.dispatch():
+                    try:
+                        await asyncio.wait_for(
+                            self._stopping.wait(), self._poll_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.drain()
+            await self._engine.stop()
+            log.info("Summary worker stopped")
+
+    async def dispatch(self) -> int:
+        """Claim as many jobs as there are free slots and start them."""
+        free = self._concurrency - len(self._in_flight)
+        if free <= 0:
+            return 0
+
+        async with self._sessionmanager.session() as db:
+            claimed = await jobs.claim(
+                free, self._lease_seconds, self._max_attempts, db
+            )
+
+        for job in claimed:
+            task = asyncio.create_task(self._execute(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return len(claimed)
+
+    async def drain(self) -> None:
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _execute(self, job: SummaryJob) -> None:
+        SUMMARY_JOBS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            future = await self._engine.submit(
+                job.summary_id, job.url, timeout=self._lease_seconds
+            )
+            await future
+        except Exception as exc:
+            SUMMARY_JOB_LATENCY.labels("failure").observe(time.perf_counter() - started)
+            log.warning(
+                "Summary job %s failed (attempt %s/%s): %r",
+                job.id,
+                job.attempts,
+                self._max_attempts,
+                exc,
+            )
+            async with self._sessionmanager.session() as db:
+                await jobs.fail(
+                    job,
+                    repr(exc),
+                    self._max_attempts,
+                    self._backoff_base,
+                    self._backoff_max,
+                    db,
+                )
+        else:
+            SUMMARY_JOB_LATENCY.labels("success").observe(time.perf_counter() - started)
+            async with self._sessionmanager.session() as db:
+                await jobs.complete(job.id, db)
+        finally:
+            SUMMARY_JOBS_IN_PROGRESS.dec()
+
+
+async def main() -> None:
+    worker = Worker(
+        sessionmanager,
+        summary_engine,
+        concurrency=settings.worker_concurrency,
+        poll_interval=settings.worker_poll_interval,
+        lease_seconds=settings.worker_lease_seconds,
+        max_attempts=settings.worker_max_attempts,
+        backoff_base=settings.worker_backoff_base,
+        backoff_max=settings.worker_backoff_max,
+    )
+
+    instrument_queries()
+    log_slow_queries(settings.slow_query_threshold)
+    if settings.worker_metrics_port:
+        start_http_server(settings.worker_metrics_port, registry=registry())
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.DEBUG if settings.log_level == "DEBUG" else logging.INFO,
+    )
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark suite runner.
+
+    DATABASE_TEST_URL=... python -m benchmarks --output results.json
+    python -m benchmarks.compare baseline.json results.json
+
+The test database is dropped, recreated and seeded, so never point
+DATABASE_TEST_URL at data you care about.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.db import DatabaseSessionManager
+from benchmarks import api, backends, listing, serialization, summarizer
+from benchmarks.common import (
+    benchmark_database_url,
+    reset_database,
+    seed,
+    write_results,
+)
+
+SUITES = ("api", "listing", "summarizer", "backends", "serialization")
+
+
+async def run(args) -> None:
+    results = []
+    sessionmanager = DatabaseSessionManager(benchmark_database_url())
+    try:
+        if "api" in args.suites:
+            await reset_database(sessionmanager)
+            await seed(sessionmanager, args.api_rows)
+            results += await api.run(sessionmanager, args.api_rows, args.iterations)
+
+        if "listing" in args.suites:
+            for rows in args.listing_rows:
+                await reset_database(sessionmanager)
+                await seed(sessionmanager, rows)
+                results += await listing.run(sessionmanager, rows, args.iterations)
+
+        if "summarizer" in args.suites:
+            results += await summarizer.run(
+                args.summarizer_jobs, args.processes, args.concurrency
+            )
+
+        if "backends" in args.suites:
+            results += await backends.run(args.iterations)
+
+        if "serialization" in args.suites:
+            results += await serialization.run(args.iterations)
+    finally:
+        await reset_database(sessionmanager)
+        await sessionmanager.close()
+
+    for result in results:
+        print(result)
+    if args.output:
+        write_results(args.output, results)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    # Not `choices=SUITES`: argparse checks the whole (default or empty)
+    # list against the choices when no suite is given
+    parser.add_argument("suites", nargs="*", help=f"any of {', '.join(SUITES)}")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--api-rows", type=int, default=10_000)
+    parser.add_argument(
+        "--listing-rows", type=int, nargs="+", default=[10_000, 1_000_000]
+    )
+    parser.add_argument("--summarizer-jobs", type=int, default=50)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+    unknown = [suite for suite in args.suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites {', '.join(unknown)}, expected {SUITES}")
+    args.suites = args.suites or list(SUITES)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
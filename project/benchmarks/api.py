@@ -0,0 +1,115 @@
+"""
+Latency and throughput of each summaries endpoint, in process through the
+ASGI transport (no network, no server), against a seeded test database.
+"""
+
+import itertools
+from typing import List
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db import (
+    DatabaseSessionManager,
+    get_db_session,
+    get_db_session_factory,
+    get_read_db_session,
+    get_read_db_session_factory,
+)
+from app.main import create_application
+from app.notifications import SummaryNotifier, get_summary_notifier
+from benchmarks.common import Result, benchmark_database_url, measure
+
+
+def create_client(sessionmanager: DatabaseSessionManager) -> AsyncClient:
+    async def override_get_db_session():
+        async with sessionmanager.session() as session:
+            yield session
+
+    app = create_application()
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_db_session] = override_get_db_session
+    app.dependency_overrides[get_db_session_factory] = lambda: sessionmanager.session
+    app.dependency_overrides[get_read_db_session_factory] = (
+        lambda: sessionmanager.session
+    )
+    notifier = SummaryNotifier(benchmark_database_url())
+    app.dependency_overrides[get_summary_notifier] = lambda: notifier
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+
+def check(response, status: int = 200):
+    if response.status_code != status:
+        raise RuntimeError(f"{response.request.url}: {response.status_code}")
+    return response
+
+
+async def run(
+    sessionmanager: DatabaseSessionManager, rows: int, iterations: int
+) -> List[Result]:
+    """Expects `rows` seeded summaries with ids 1..rows."""
+    results = []
+    ids = itertools.cycle(range(1, rows + 1))
+
+    async with create_client(sessionmanager) as client:
+
+        async def create(i):
+            check(
+                await client.post("/summaries/", json={"url": f"https://new.test/{i}"}),
+                201,
+            )
+
+        async def create_bulk(i):
+            urls = [{"url": f"https://bulk.test/{i}/{n}"} for n in range(100)]
+            check(await client.post("/summaries/bulk/", json=urls), 201)
+            return len(urls)
+
+        async def read(i):
+            check(await client.get(f"/summaries/{next(ids)}/"))
+
+        async def read_conditional(i):
+            summary_id = next(ids)
+            etag = check(await client.get(f"/summaries/{summary_id}/")).headers["etag"]
+            headers = {"If-None-Match": etag}
+            check(await client.get(f"/summaries/{summary_id}/", headers=headers), 304)
+
+        async def list_page(i):
+            response = check(await client.get("/summaries/", params={"limit": 100}))
+            return len(response.json())
+
+        async def list_page_full(i):
+            params = {"limit": 100, "fields": "id,url,summary,created_at"}
+            response = check(await client.get("/summaries/", params=params))
+            return len(response.json())
+
+        async def search(i):
+            params = {"q": "lorem", "limit": 100}
+            return len(check(await client.get("/summaries/", params=params)).json())
+
+        async def update(i):
+            summary_id = next(ids)
+            payload = {"url": f"https://bench.test/{summary_id}", "summary": str(i)}
+            check(await client.put(f"/summaries/{summary_id}/", json=payload))
+
+        for name, operation in (
+            ("api.create_summary", create),
+            ("api.create_summaries_bulk_100", create_bulk),
+            ("api.read_summary", read),
+            ("api.read_summary_not_modified", read_conditional),
+            ("api.list_summaries", list_page),
+            ("api.list_summaries_with_text", list_page_full),
+            ("api.search_summaries", search),
+            ("api.update_summary", update),
+        ):
+            results.append(await measure(name, operation, iterations))
+
+        params = {"url_prefix": "https://new.test/", "limit": 1000}
+        created = check(await client.get("/summaries/", params=params)).json()
+
+        async def delete(i):
+            check(await client.delete(f"/summaries/{created[i]['id']}/"))
+
+        results.append(
+            await measure("api.delete_summary", delete, len(created), warmup=0)
+        )
+
+    return results
@@ -0,0 +1,89 @@
+"""
+Summarizer backends compared on the fixture corpus (benchmarks/fixtures):
+CPU time per pass over the corpus of each backend, one article at a time
+and as a single batch, of the sentence splitting they share, and how many
+of newspaper's summary sentences each backend picks (1.00 means identical
+summaries). Needs the NLTK punkt_tab data.
+"""
+
+import glob
+import os
+from collections import Counter
+from typing import List, Tuple
+
+from newspaper import nlp
+
+from app import summarizer
+from app.summarizer_backends import BACKENDS
+from benchmarks.common import Result, measure
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_corpus(repeat: int = 1) -> List[Tuple[str, str]]:
+    """(title, text) of every fixture article, each text repeated `repeat` times."""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path) as f:
+            title, text = summarizer.extract_article(f"file://{path}", f.read())
+        corpus.append((title, "\n\n".join([text] * repeat)))
+    return corpus
+
+
+def agreement(summaries: List[List[str]], reference: List[List[str]]) -> float:
+    """Share of the reference sentences that the other summaries contain too."""
+    found = sum(
+        sum((Counter(s) & Counter(r)).values()) for s, r in zip(summaries, reference)
+    )
+    return found / max(sum(len(r) for r in reference), 1)
+
+
+async def run(iterations: int) -> List[Result]:
+    summarizer.warm_up()
+    results = []
+    for repeat, size in ((1, "article"), (10, "long")):
+        corpus = load_corpus(repeat)
+        max_sents = summarizer._config.MAX_SUMMARY_SENT
+
+        async def split(i):
+            for _, text in corpus:
+                nlp.split_sentences(text)
+            return len(corpus)
+
+        results.append(
+            await measure(f"backends.{size}.split_sentences", split, iterations)
+        )
+
+        summaries = {}
+        for name, backend_class in BACKENDS.items():
+            backend = backend_class()
+            summaries[name] = [
+                backend.summarize(title, text, max_sents) for title, text in corpus
+            ]
+
+            async def summarize(i):
+                for title, text in corpus:
+                    backend.summarize(title, text, max_sents)
+                return len(corpus)
+
+            async def summarize_batch(i):
+                backend.summarize_many(corpus, max_sents)
+                return len(corpus)
+
+            results.append(
+                await measure(f"backends.{size}.{name}", summarize, iterations)
+            )
+            results.append(
+                await measure(
+                    f"backends.{size}.{name}_batch", summarize_batch, iterations
+                )
+            )
+
+        for name in BACKENDS:
+            if name == "newspaper":
+                continue
+            print(
+                f"backends.{size}.{name:<10} agreement with newspaper "
+                f"{agreement(summaries[name], summaries['newspaper']):.2f}"
+            )
+    return results
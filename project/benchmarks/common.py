@@ -0,0 +1,136 @@
+"""
+Shared helpers of the benchmark suite: timing, seeding and result files.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import text
+
+from app.db import DatabaseSessionManager
+from app.models.sqlalchemy import Base
+
+
+def benchmark_database_url() -> str:
+    """Benchmarks only ever touch the disposable test database."""
+    return os.environ["DATABASE_TEST_URL"]
+
+
+class Result:
+    def __init__(self, name: str, latencies: List[float], items: int = 0):
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.items = items  # objects handled, e.g. rows listed
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.latencies)
+
+    def percentile(self, p: float) -> float:
+        index = min(len(self.latencies) - 1, int(p / 100 * len(self.latencies)))
+        return self.latencies[index]
+
+    def as_dict(self) -> dict:
+        result = {
+            "name": self.name,
+            "ops": len(self.latencies),
+            "seconds": round(self.seconds, 6),
+            "ops_per_second": round(len(self.latencies) / self.seconds, 2),
+            "mean_ms": round(statistics.fmean(self.latencies) * 1000, 3),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+        }
+        if self.items:
+            result["items_per_second"] = round(self.items / self.seconds, 2)
+        return result
+
+    def __str__(self) -> str:
+        result = self.as_dict()
+        line = (
+            f"{self.name:<40} {result['ops_per_second']:>10,.1f} ops/s"
+            f"  p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms"
+        )
+        if self.items:
+            line += f"  {result['items_per_second']:>12,.0f} items/s"
+        return line
+
+
+async def measure(
+    name: str,
+    operation: Callable[[int], Awaitable[Optional[int]]],
+    iterations: int,
+    warmup: int = 3,
+) -> Result:
+    """
+    Run `operation(i)` sequentially and time each call. An operation may
+    return the number of items it handled, reported as items/second.
+    """
+    for i in range(warmup):
+        await operation(i)
+
+    latencies, items = [], 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        handled = await operation(warmup + i)
+        latencies.append(time.perf_counter() - started)
+        items += handled or 0
+    return Result(name, latencies, items)
+
+
+async def reset_database(sessionmanager: DatabaseSessionManager) -> None:
+    async with sessionmanager.connect() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed(sessionmanager: DatabaseSessionManager, rows: int) -> None:
+    """
+    Insert `rows` summaries server side with generate_series, so even a
+    million rows take seconds, then ANALYZE for realistic plans.
+    """
+    async with sessionmanager.connect() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO text_summary "
+                "(url, normalized_url, summary, created_at, updated_at) "
+                "SELECT 'https://bench.test/' || i, 'https://bench.test/' || i, "
+                "CASE WHEN i % 10 = 0 THEN '' "
+                "ELSE repeat('lorem ipsum dolor sit amet ', 20) END, "
+                "now() at time zone 'utc' - i * interval '1 second', "
+                "now() at time zone 'utc' "
+                "FROM generate_series(1, :rows) AS i"
+            ),
+            {"rows": rows},
+        )
+    async with sessionmanager.connect() as conn:
+        await conn.execute(text("ANALYZE text_summary"))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, results: List[Result]) -> None:
+    document = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": [result.as_dict() for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
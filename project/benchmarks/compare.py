@@ -0,0 +1,46 @@
+"""
+Compare two result files of `python -m benchmarks`.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 10
+
+Exits with status 1 when a benchmark's p50 latency got worse by more than
+`threshold` percent, so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    regressed = False
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>10} {result['p50_ms']:>8.2f}ms {'new':>8}")
+            continue
+
+        before, after = baseline[name]["p50_ms"], result["p50_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressed = True
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before:>8.2f}ms {after:>8.2f}ms {change:>+7.1f}%{flag}")
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+    sys.exit(
+        1 if compare(load(args.baseline), load(args.current), args.threshold) else 0
+    )
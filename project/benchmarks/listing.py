@@ -0,0 +1,75 @@
+"""
+Listing at scale: first and deep pages through the API, NDJSON streaming of
+the whole table, and ORM instances + SummarySchema per row versus selected
+columns serialized through a TypeAdapter (the read fast path).
+"""
+
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.api import crud
+from app.api.summaries import summary_rows_adapter
+from app.db import DatabaseSessionManager
+from app.models.pydantic import SummarySchema
+from benchmarks.api import check, create_client
+from benchmarks.common import Result, measure
+
+summary_list_adapter = TypeAdapter(List[SummarySchema])
+
+
+async def run(
+    sessionmanager: DatabaseSessionManager, rows: int, iterations: int
+) -> List[Result]:
+    """Expects `rows` seeded summaries with ids 1..rows."""
+    results = []
+    prefix = f"listing.{rows}"
+    page = min(rows, 1000)
+
+    async def orm_listing(i):
+        async with sessionmanager.session() as db:
+            summaries = await crud.get_all(db, limit=page)
+            summary_list_adapter.dump_json(
+                [
+                    SummarySchema.model_validate(summary, from_attributes=True)
+                    for summary in summaries
+                ]
+            )
+            return len(summaries)
+
+    async def core_listing(i):
+        async with sessionmanager.session() as db:
+            summary_rows_adapter.dump_json(await crud.get_all_rows(db, limit=page))
+            return page
+
+    results.append(await measure(f"{prefix}.serialize_orm", orm_listing, iterations))
+    results.append(await measure(f"{prefix}.serialize_core", core_listing, iterations))
+
+    async with create_client(sessionmanager) as client:
+
+        async def first_page(i):
+            response = await client.get("/summaries/", params={"limit": 100})
+            return len(check(response).json())
+
+        async def deep_page(i):
+            params = {"limit": 100, "after": rows - 200}
+            return len(check(await client.get("/summaries/", params=params)).json())
+
+        async def newest_page(i):
+            params = {"limit": 100, "sort": "-created_at"}
+            return len(check(await client.get("/summaries/", params=params)).json())
+
+        async def stream(i):
+            lines = 0
+            params = {"stream": True, "fields": "id,url,summary,created_at"}
+            async with client.stream("GET", "/summaries/", params=params) as response:
+                async for _ in response.aiter_lines():
+                    lines += 1
+            return lines
+
+        results.append(await measure(f"{prefix}.first_page", first_page, iterations))
+        results.append(await measure(f"{prefix}.deep_page", deep_page, iterations))
+        results.append(await measure(f"{prefix}.newest_page", newest_page, iterations))
+        results.append(await measure(f"{prefix}.stream_all", stream, 3, warmup=0))
+
+    return results
@@ -0,0 +1,76 @@
+"""
+Response serialization of a summary and of a 100 summary page, without the
+database or HTTP: FastAPI's response_model path (validate the returned model
+again, dump it to Python, then json.dumps or orjson.dumps) versus the cached
+TypeAdapters the summary routes use (one dump_json of the trusted model).
+"""
+
+import json
+from datetime import datetime
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from app.api.summaries import summary_adapter
+from app.models.pydantic import SummaryRecordSchema, SummarySchema
+from benchmarks.common import Result, measure
+
+summary_list_adapter = TypeAdapter(List[SummarySchema])
+
+
+def records(count: int) -> List[SummaryRecordSchema]:
+    now = datetime.utcnow()
+    return [
+        SummaryRecordSchema(
+            id=i,
+            url=f"https://bench.test/{i}",
+            summary="Lorem ipsum dolor sit amet. " * 20,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def response_model_path(adapter: TypeAdapter, dumps: Callable) -> Callable:
+    """What FastAPI does with a route's return value and response_model."""
+
+    def serialize(value):
+        return dumps(adapter.dump_python(adapter.validate_python(value), mode="json"))
+
+    return serialize
+
+
+async def run(iterations: int) -> List[Result]:
+    # Optional dependency, like the orjson response class
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    results = []
+    for size, adapter, value in (
+        ("single", summary_adapter, records(1)[0]),
+        ("list_100", summary_list_adapter, records(100)),
+    ):
+        paths = {
+            "response_model_json": response_model_path(
+                adapter, lambda content: json.dumps(content).encode()
+            ),
+            "adapter": adapter.dump_json,
+        }
+        if orjson is not None:
+            paths["response_model_orjson"] = response_model_path(adapter, orjson.dumps)
+
+        for name, serialize in paths.items():
+
+            async def operation(i):
+                # Timing a single call is too coarse, serialize 100 times
+                for _ in range(100):
+                    serialize(value)
+                return 100
+
+            results.append(
+                await measure(f"serialization.{size}.{name}", operation, iterations)
+            )
+    return results
@@ -0,0 +1,78 @@
+"""
+Summarizer throughput against a local static HTML server, so results do not
+depend on the network or on remote sites: the NLP step alone, and fetch +
+NLP through a SummaryEngine with its process pool. Writing the summary back
+is a single UPDATE and is covered by the API benchmarks.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+from app.engine import SummaryEngine
+from app.summarizer import summarize_html
+from benchmarks.common import Result, measure
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def fixture_server() -> Iterator[str]:
+    """Serve benchmarks/fixtures on a free local port, yielding its base URL."""
+    handler = functools.partial(QuietHandler, directory=FIXTURES)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def run(jobs: int, processes: int, concurrency: int) -> List[Result]:
+    results = []
+    with fixture_server() as base_url:
+        url = f"{base_url}/article.html"
+        with open(os.path.join(FIXTURES, "article.html")) as f:
+            html = f.read()
+
+        async def nlp(i):
+            summarize_html(url, html)
+
+        results.append(await measure("summarizer.summarize_html", nlp, 20))
+
+        engine = SummaryEngine(processes=processes, concurrency=concurrency)
+
+        async def process(summary_id, url):
+            page = await engine._fetcher.fetch_page(url)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(engine._executor, summarize_html, url, page.html)
+
+        engine._process = process
+        # start() spawns the pool and loads the NLP resources in each process
+        await engine.start()
+        try:
+            started = time.perf_counter()
+            futures = [await engine.submit(i, url, timeout=60) for i in range(jobs)]
+            await asyncio.gather(*futures)
+            elapsed = time.perf_counter() - started
+        finally:
+            await engine.stop()
+
+        results.append(
+            Result(
+                f"summarizer.engine_p{processes}_c{concurrency}", [elapsed], items=jobs
+            )
+        )
+    return results
@@ -1,15 +1,27 @@
 import os
 
+import nltk
 import pytest
 from alembic.config import Config
 from alembic.migration import MigrationContext
 from alembic.operations import Operations
 from alembic.script import ScriptDirectory
+from app import batcher, summarizer
+from app.cache import summary_cache
 from app.config import Settings, get_settings
-from app.db import get_db_session, DatabaseSessionManager
+from app.content_cache import content_cache
+from app.db import (
+    get_db_session,
+    get_db_session_factory,
+    get_read_db_session,
+    get_read_db_session_factory,
+    DatabaseSessionManager,
+)
 from app.main import app, create_application
-from app.models.sqlalchemy import Base
+from app.models.sqlalchemy import Base, ContentSummary, FetchedPage, TextSummary
+from app.notifications import SummaryNotifier, get_summary_notifier
 from asyncpg import Connection
+from sqlalchemy import delete, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
@@ -28,11 +40,86 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    summary_cache.clear()
+
+
+@pytest.fixture
+def nltk_data(tmp_path, monkeypatch):
+    """
+    An NLTK data dir with an empty punkt_tab model, for this process and the
+    processes it spawns.
+    """
+    english = tmp_path / "tokenizers" / "punkt_tab" / "english"
+    english.mkdir(parents=True)
+    for name in (
+        "abbrev_types.txt",
+        "collocations.tab",
+        "ortho_context.tab",
+        "sent_starters.txt",
+    ):
+        (english / name).touch()
+    monkeypatch.setenv("NLTK_DATA", str(tmp_path))
+    monkeypatch.setattr(nltk.data, "path", [str(tmp_path)])
+    return tmp_path
+
+
 @pytest.fixture(scope="module")
-async def test_app_with_db():
+async def test_sessionmanager():
     # Create a new session manager for the test DB
     test_sessionmanager = DatabaseSessionManager(DATABASE_TEST_URL, {"echo": False})
 
+    # Create tables
+    async with test_sessionmanager.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield test_sessionmanager
+
+    # Drop tables and close engine
+    async with test_sessionmanager.connect() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await test_sessionmanager.close()
+
+
+@pytest.fixture
+async def db(test_sessionmanager):
+    """A session on the test database, with no summaries or cached content."""
+    async with test_sessionmanager.session() as session:
+        for model in (FetchedPage, ContentSummary, TextSummary):
+            await session.execute(delete(model))
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def summarizer_sessionmanager(test_sessionmanager, monkeypatch):
+    """
+    Point the sessions the summarizer and the batcher open themselves at the
+    test database, and keep the content cache from evicting.
+    """
+    monkeypatch.setattr(summarizer, "sessionmanager", test_sessionmanager)
+    monkeypatch.setattr(batcher, "sessionmanager", test_sessionmanager)
+    monkeypatch.setattr(content_cache, "evict_every", 1000)
+    return test_sessionmanager
+
+
+@pytest.fixture
+def query_counter(test_sessionmanager):
+    """List of the SQL statements sent to the test database during a test."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = test_sessionmanager._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture(scope="module")
+async def test_app_with_db(test_sessionmanager):
     # Dependency override
     async def override_get_db_session():
         async with test_sessionmanager.session() as session:
@@ -40,10 +127,15 @@ async def test_app_with_db():
 
     app = create_application()
     app.dependency_overrides[get_db_session] = override_get_db_session
-
-    # Create tables
-    async with test_sessionmanager.connect() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    app.dependency_overrides[get_db_session_factory] = (
+        lambda: test_sessionmanager.session
+    )
+    app.dependency_overrides[get_read_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_db_session_factory] = (
+        lambda: test_sessionmanager.session
+    )
+    test_notifier = SummaryNotifier(DATABASE_TEST_URL)
+    app.dependency_overrides[get_summary_notifier] = lambda: test_notifier
 
     # Use httpx.AsyncClient with ASGITransport
     from httpx import AsyncClient, ASGITransport
@@ -51,10 +143,7 @@ async def test_app_with_db():
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
-    # Drop tables and close engine
-    async with test_sessionmanager.connect() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    await test_sessionmanager.close()
+    await test_notifier.stop()
 
 
 def run_migrations(connection: Connection):
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app import batcher
+from app.batcher import SummaryBatcher
+from app.content_cache import content_cache
+from app.models.sqlalchemy import TextSummary
+from sqlalchemy import select
+
+
+@pytest.fixture
+async def summaries(db, summarizer_sessionmanager):
+    rows = [TextSummary(url=f"https://foo.bar/{i}", summary="") for i in range(5)]
+    db.add_all(rows)
+    await db.commit()
+    return [row.id for row in rows]
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """The articles of every summarize_batch call."""
+    calls = []
+
+    def summarize_batch(articles):
+        calls.append(articles)
+        return [f"summary of {title}" for title, _ in articles]
+
+    monkeypatch.setattr(batcher, "summarize_batch", summarize_batch)
+    return calls
+
+
+@pytest.fixture
+async def summary_batcher():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        summary_batcher = SummaryBatcher(executor, batch_size=4, max_wait=0.05)
+        await summary_batcher.start()
+        yield summary_batcher
+        await summary_batcher.stop()
+
+
+@pytest.mark.anyio
+async def test_batches_articles(
+    summaries, batches, summary_batcher, test_sessionmanager, query_counter
+):
+    await asyncio.gather(
+        *[
+            summary_batcher.summarize(id, f"hash{id}", (f"title {id}", "text"))
+            for id in summaries
+        ]
+    )
+
+    assert [len(articles) for articles in batches] == [4, 1]
+    # One INSERT into the content cache and one UPDATE per batch
+    updates = [s for s in query_counter if s.lstrip().startswith("UPDATE text_summary")]
+    assert len(updates) == 2
+    assert all("VALUES" in statement for statement in updates)
+
+    async with test_sessionmanager.session() as db:
+        result = await db.execute(
+            select(TextSummary.id, TextSummary.summary, TextSummary.summarized_at)
+            .where(TextSummary.id.in_(summaries))
+            .order_by(TextSummary.id)
+        )
+        rows = result.all()
+        cached = await content_cache.get_summary(f"hash{summaries[0]}", db)
+    assert [(id, summary) for id, summary, _ in rows] == [
+        (id, f"summary of title {id}") for id in summaries
+    ]
+    assert all(summarized_at is not None for _, _, summarized_at in rows)
+    assert cached == f"summary of title {summaries[0]}"
+
+
+@pytest.mark.anyio
+async def test_skips_cancelled_jobs(summaries, batches, summary_batcher):
+    first, second = summaries[:2]
+    job = asyncio.create_task(summary_batcher.summarize(first, "a", ("first", "")))
+    await asyncio.sleep(0)
+    job.cancel()
+    await summary_batcher.summarize(second, "b", ("second", ""))
+
+    assert batches == [[("second", "")]]
+
+
+@pytest.mark.anyio
+async def test_batch_failure_fails_every_job(summaries, monkeypatch, summary_batcher):
+    def summarize_batch(articles):
+        raise ValueError("broken")
+
+    monkeypatch.setattr(batcher, "summarize_batch", summarize_batch)
+    results = await asyncio.gather(
+        *[summary_batcher.summarize(id, "x", ("t", "")) for id in summaries[:3]],
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ValueError] * 3
@@ -0,0 +1,69 @@
+import json
+
+import httpx
+import pytest
+from benchmarks.backends import agreement
+from benchmarks.common import Result
+from benchmarks.compare import compare
+from benchmarks.serialization import records, response_model_path, summary_list_adapter
+from benchmarks.summarizer import fixture_server
+
+
+def test_result_percentiles():
+    result = Result("bench", [0.004, 0.001, 0.003, 0.002], items=40)
+    as_dict = result.as_dict()
+
+    assert as_dict["ops"] == 4
+    assert as_dict["p50_ms"] == 3.0
+    assert as_dict["p99_ms"] == 4.0
+    assert as_dict["items_per_second"] == 4000
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}}
+
+    assert not compare(baseline, {"a": {"p50_ms": 10.5}, "c": {"p50_ms": 1}}, 10)
+    assert compare(baseline, {"b": {"p50_ms": 12.0}}, 10)
+
+
+def test_fixture_server():
+    with fixture_server() as base_url:
+        response = httpx.get(f"{base_url}/article.html")
+    assert response.status_code == 200
+    assert "<article>" in response.text
+
+
+def test_backend_agreement():
+    reference = [["a", "b"], ["c", "c"]]
+
+    assert agreement(reference, reference) == 1.0
+    assert agreement([["b", "x"], ["c"]], reference) == 0.5
+
+
+def test_serialization_paths_agree():
+    summaries = records(3)
+    response_model = response_model_path(
+        summary_list_adapter, lambda content: json.dumps(content).encode()
+    )
+
+    assert json.loads(response_model(summaries)) == json.loads(
+        summary_list_adapter.dump_json(summaries)
+    )
+
+
+def test_main_runs_every_suite_by_default(monkeypatch):
+    import benchmarks.__main__ as runner
+
+    runs = []
+
+    async def run(args):
+        runs.append(args)
+
+    monkeypatch.setattr(runner, "run", run)
+    runner.main([])
+    runner.main(["api", "backends", "--iterations", "5"])
+
+    assert runs[0].suites == list(runner.SUITES)
+    assert (runs[1].suites, runs[1].iterations) == (["api", "backends"], 5)
+    with pytest.raises(SystemExit):
+        runner.main(["apis"])
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+from app.api import crud
+from app.cache import MemoryCache, RedisCache, summary_cache, summary_key
+from app.db import DatabaseSessionManager
+from app.models.sqlalchemy import TextSummary
+from app.notifications import (
+    SummaryNotifier,
+    forget_cached_summary,
+    summary_updated_notification,
+)
+from sqlalchemy import update
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.mark.anyio
+async def test_memory_cache_lru():
+    cache = MemoryCache(ttl=60, max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1  # "b" is now least recently used
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+    assert cache.stats() == {"backend": "memory", "hits": 2, "misses": 1, "size": 2}
+
+
+@pytest.mark.anyio
+async def test_memory_cache_ttl(monkeypatch):
+    cache = MemoryCache(ttl=60)
+    await cache.set("a", 1)
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now + 61)
+    assert await cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.anyio
+async def test_redis_cache():
+    client = FakeRedis()
+    cache = RedisCache(client, ttl=60)
+    await cache.set("summary:1", {"id": 1})
+
+    assert json.loads(client.data["summary:1"]) == {"id": 1}
+    assert await cache.get("summary:1") == {"id": 1}
+    await cache.delete("summary:1")
+    assert await cache.get("summary:1") is None
+    assert cache.stats() == {"backend": "redis", "hits": 1, "misses": 1}
+
+
+async def create_completed_summary(test_app_with_db, url):
+    response = await test_app_with_db.post("/summaries/", json={"url": url})
+    summary_id = response.json()["id"]
+    await test_app_with_db.put(
+        f"/summaries/{summary_id}/", json={"url": url, "summary": "done"}
+    )
+    return summary_id
+
+
+@pytest.mark.anyio
+async def test_read_summary_served_from_cache(test_app_with_db, monkeypatch):
+    summary_id = await create_completed_summary(
+        test_app_with_db, "https://foo.bar/cached"
+    )
+
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert response.json()["summary"] == "done"
+
+    async def mock_get(id, db):
+        raise AssertionError("cache hit should not query the database")
+
+    monkeypatch.setattr(crud, "get", mock_get)
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert response.status_code == 200
+    assert response.json()["summary"] == "done"
+
+    response = await test_app_with_db.get("/cache/stats")
+    assert response.json()["hits"] == 1
+    assert response.json()["misses"] == 1
+
+
+@pytest.mark.anyio
+async def test_pending_summary_not_cached(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://foo.bar/pending"}
+    )
+    summary_id = response.json()["id"]
+
+    await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert summary_cache.stats()["size"] == 0
+
+
+@pytest.mark.anyio
+async def test_cache_invalidated_on_put_and_delete(test_app_with_db):
+    summary_id = await create_completed_summary(
+        test_app_with_db, "https://foo.bar/invalidate"
+    )
+    await test_app_with_db.get(f"/summaries/{summary_id}/")
+
+    await test_app_with_db.put(
+        f"/summaries/{summary_id}/",
+        json={"url": "https://foo.bar/invalidate", "summary": "changed"},
+    )
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert response.json()["summary"] == "changed"
+
+    await test_app_with_db.delete(f"/summaries/{summary_id}/")
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_cache_invalidated_by_notifications(
+    test_app_with_db, test_sessionmanager
+):
+    url = "https://foo.bar/invalidate-notified"
+    summary_id = await create_completed_summary(test_app_with_db, url)
+    await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert await summary_cache.peek(summary_key(summary_id)) is not None
+
+    notifier = SummaryNotifier(
+        os.environ.get("DATABASE_TEST_URL"), on_update=forget_cached_summary
+    )
+    await notifier.start()
+    try:
+        # What the worker does from its own process
+        async with test_sessionmanager.session() as db:
+            await db.execute(
+                update(TextSummary)
+                .where(TextSummary.id == summary_id)
+                .values(summary="rewritten")
+                .returning(summary_updated_notification(TextSummary.id))
+            )
+            await db.commit()
+
+        for _ in range(50):
+            if await summary_cache.peek(summary_key(summary_id)) is None:
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        await notifier.stop()
+
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    assert response.json()["summary"] == "rewritten"
+
+
+@pytest.mark.anyio
+async def test_replica_reads_not_cached(test_app_with_db):
+    summary_id = await create_completed_summary(
+        test_app_with_db, "https://foo.bar/replica-read"
+    )
+    sessionmanager = DatabaseSessionManager(
+        os.environ.get("DATABASE_TEST_URL"),
+        replica_hosts=[os.environ.get("DATABASE_TEST_URL")],
+    )
+    try:
+        async with sessionmanager.read_session() as db:
+            assert (await crud.get_cached(summary_id, db)).summary == "done"
+        assert await summary_cache.peek(summary_key(summary_id)) is None
+
+        async with sessionmanager.session() as db:
+            await crud.get_cached(summary_id, db)
+        assert await summary_cache.peek(summary_key(summary_id)) is not None
+    finally:
+        await sessionmanager.close()
+
+
+def test_memory_cache_forget():
+    cache = MemoryCache()
+    cache._entries.update(a=(float("inf"), 1), b=(float("inf"), 2))
+
+    cache.forget("a")
+    assert list(cache._entries) == ["b"]
+    cache.forget_all()
+    assert not cache._entries
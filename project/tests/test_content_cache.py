@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from app import summarizer
+from app.content_cache import ContentCache, content_hash
+from app.fetcher import ArticleFetcher, Page
+from app.models.sqlalchemy import ContentSummary, TextSummary
+from sqlalchemy import select
+
+HTML = """
+<html><head><title>Cached article</title></head><body><article>
+<p>The first paragraph of an article that is long enough to be extracted.</p>
+<p>The second paragraph of the same article, with a few more words in it.</p>
+</article></body></html>
+"""
+
+
+def test_content_hash():
+    assert content_hash("title", "text") == content_hash("title", "text")
+    assert content_hash("title", "text") != content_hash("titlet", "ext")
+    assert len(content_hash("", "")) == 64
+    assert content_hash("title", "a  b\n\nc") == content_hash(" title", "a b c")
+
+
+@pytest.mark.anyio
+async def test_page_roundtrip(db):
+    cache = ContentCache()
+    assert await cache.get_page("https://foo.bar/", db) is None
+
+    await cache.store_page("https://foo.bar/", Page("<p>1</p>", '"v1"', None), "a", db)
+    await cache.store_page("https://foo.bar/", Page("<p>2</p>", '"v2"', None), "b", db)
+
+    page = await cache.get_page("https://foo.bar/", db)
+    assert (page.html, page.etag, page.content_hash, page.size) == (
+        "<p>2</p>",
+        '"v2"',
+        "b",
+        8,
+    )
+
+
+@pytest.mark.anyio
+async def test_summary_roundtrip(db):
+    cache = ContentCache()
+    assert await cache.get_summary("a", db) is None
+
+    await cache.store_summary("a", "summary", db)
+    await cache.store_summary("a", "ignored", db)
+
+    assert await cache.get_summary("a", db) == "summary"
+
+
+@pytest.mark.anyio
+async def test_evicts_least_recently_used(db):
+    cache = ContentCache(summary_max_bytes=10, evict_every=1000)
+    for key in ("a", "b", "c"):
+        await cache.store_summary(key, "x" * 4, db)
+    # Reading "a" makes "b" the least recently used
+    await cache.get_summary("a", db)
+
+    await cache.evict(db)
+
+    keys = (await db.execute(select(ContentSummary.content_hash))).scalars().all()
+    assert sorted(keys) == ["a", "c"]
+
+
+@pytest.mark.anyio
+async def test_reads_touch_rows_with_the_next_write(db):
+    cache = ContentCache(evict_every=1000)
+    await cache.store_summary("a", "summary", db)
+    stored = await db.scalar(select(ContentSummary.accessed_at))
+
+    assert await cache.get_summary("a", db) == "summary"
+    await db.commit()
+    assert await db.scalar(select(ContentSummary.accessed_at)) == stored
+
+    await cache.store_summary("b", "summary", db)
+    accessed = select(ContentSummary.accessed_at).where(
+        ContentSummary.content_hash == "a"
+    )
+    assert await db.scalar(accessed) > stored
+
+
+@pytest.mark.anyio
+async def test_evicts_every_n_writes(db):
+    cache = ContentCache(summary_max_bytes=4, evict_every=2)
+    await cache.store_summary("a", "x" * 4, db)
+    await cache.store_summary("b", "x" * 4, db)
+
+    keys = (await db.execute(select(ContentSummary.content_hash))).scalars().all()
+    assert keys == ["b"]
+
+
+@pytest.mark.anyio
+async def test_generate_summary_reuses_cache(
+    db, summarizer_sessionmanager, monkeypatch
+):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=HTML, headers={"ETag": '"v1"'})
+
+    summarized = []
+
+    def summarize_text(title, text):
+        summarized.append(title)
+        return f"summary of {title}"
+
+    monkeypatch.setattr(summarizer, "summarize_text", summarize_text)
+
+    summaries = [TextSummary(url=f"https://foo.bar/{i}", summary="") for i in range(3)]
+    db.add_all(summaries)
+    await db.commit()
+
+    fetcher = ArticleFetcher(transport=httpx.MockTransport(handler))
+    await fetcher.start()
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Same content under two URLs, then the first URL again
+            for summary, url in zip(summaries, ["a", "b", "a"]):
+                await summarizer.generate_summary(
+                    summary.id, f"https://foo.bar/{url}", fetcher, executor
+                )
+    finally:
+        await fetcher.stop()
+
+    assert summarized == ["Cached article"]
+    assert [r.headers.get("if-none-match") for r in requests] == [None, None, '"v1"']
+
+    db.expire_all()
+    result = await db.execute(select(TextSummary.summary).order_by(TextSummary.id))
+    assert result.scalars().all() == ["summary of Cached article"] * 3
+
+
+@pytest.mark.anyio
+async def test_generate_summary_ignores_volatile_markup(
+    db, summarizer_sessionmanager, monkeypatch
+):
+    def handler(request):
+        # A fresh nonce and reflowed markup on every fetch
+        nonce = len(requests)
+        requests.append(request)
+        html = HTML.replace(
+            "<head>", f'<head><script nonce="{nonce}">var t = {nonce};</script>'
+        ).replace("enough to", "enough" + "\n  " * (nonce + 1) + "to")
+        return httpx.Response(200, html=html)
+
+    requests = []
+    summarized = []
+
+    def summarize_text(title, text):
+        summarized.append(title)
+        return f"summary of {title}"
+
+    monkeypatch.setattr(summarizer, "summarize_text", summarize_text)
+
+    summaries = [TextSummary(url=f"https://foo.bar/{i}", summary="") for i in range(2)]
+    db.add_all(summaries)
+    await db.commit()
+
+    fetcher = ArticleFetcher(transport=httpx.MockTransport(handler))
+    await fetcher.start()
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for summary in summaries:
+                await summarizer.generate_summary(
+                    summary.id, summary.url, fetcher, executor
+                )
+    finally:
+        await fetcher.stop()
+
+    assert len(requests) == 2
+    assert summarized == ["Cached article"]
@@ -0,0 +1,211 @@
+import os
+
+import pytest
+from app.config import Settings
+from app.db import DatabaseSessionManager, engine_kwargs_from_settings
+from sqlalchemy import exc, text
+
+DATABASE_TEST_URL = os.environ.get("DATABASE_TEST_URL")
+
+
+def test_engine_kwargs_from_settings():
+    settings = Settings(
+        database_url=DATABASE_TEST_URL,
+        db_pool_size=3,
+        db_max_overflow=1,
+        db_pool_pre_ping=True,
+        db_statement_cache_size=0,
+    )
+    kwargs = engine_kwargs_from_settings(settings)
+
+    assert kwargs["pool_size"] == 3
+    assert kwargs["max_overflow"] == 1
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"] == {"statement_cache_size": 0}
+
+
+@pytest.mark.anyio
+async def test_pool_stats():
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL,
+        {"pool_size": 1, "max_overflow": 0, "pool_timeout": 0.1},
+        pool_warn_after=0.05,
+    )
+
+    async with sessionmanager.session() as db:
+        await db.execute(text("SELECT 1"))
+        stats = sessionmanager.pool_stats()
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            async with sessionmanager.session() as other:
+                await other.execute(text("SELECT 1"))
+
+    stats = sessionmanager.pool_stats()
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_histogram"]["0.005"] >= 0
+    assert stats["wait_seconds_histogram"]["inf"] == 2
+
+    await sessionmanager.close()
+
+
+def test_pool_stats_endpoint(test_app):
+    response = test_app.get("/pool/stats")
+    assert response.status_code == 200
+    assert {"checked_out", "overflow", "timeouts"} <= response.json().keys()
+
+
+@pytest.mark.anyio
+async def test_read_session_round_robin():
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL, replica_hosts=[DATABASE_TEST_URL, DATABASE_TEST_URL]
+    )
+    primary = sessionmanager._engine
+    first, second = sessionmanager._replicas
+
+    binds = []
+    for _ in range(3):
+        async with sessionmanager.read_session() as db:
+            await db.execute(text("SELECT 1"))
+            binds.append(db.bind)
+    assert binds == [first, second, first]
+
+    async with sessionmanager.session() as db:
+        assert db.bind is primary
+    assert len(sessionmanager.pool_stats()["replicas"]) == 2
+
+    await sessionmanager.close()
+
+
+@pytest.mark.anyio
+async def test_read_session_least_busy():
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL,
+        replica_hosts=[DATABASE_TEST_URL, DATABASE_TEST_URL],
+        replica_selection="least_busy",
+    )
+    first, second = sessionmanager._replicas
+
+    async with sessionmanager.read_session() as busy:
+        await busy.execute(text("SELECT 1"))
+        assert busy.bind is first
+        async with sessionmanager.read_session() as db:
+            assert db.bind is second
+
+    await sessionmanager.close()
+
+
+@pytest.mark.anyio
+async def test_read_session_without_replicas_uses_primary():
+    sessionmanager = DatabaseSessionManager(DATABASE_TEST_URL)
+
+    assert not sessionmanager.has_replicas
+    async with sessionmanager.read_session() as db:
+        assert db.bind is sessionmanager._engine
+
+    await sessionmanager.close()
+
+
+@pytest.mark.anyio
+async def test_reads_stick_to_primary_after_write(monkeypatch):
+    from app import db as db_module
+    from fastapi import Depends, FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL, replica_hosts=[DATABASE_TEST_URL]
+    )
+    monkeypatch.setattr(db_module, "sessionmanager", sessionmanager)
+
+    app = FastAPI()
+
+    @app.post("/")
+    async def write(db=Depends(db_module.get_db_session)):
+        return {}
+
+    @app.get("/")
+    async def read(db=Depends(db_module.get_read_db_session)):
+        return {"primary": db.bind is sessionmanager._engine}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/")).json() == {"primary": False}
+
+        response = await client.post("/")
+        assert db_module.PRIMARY_COOKIE in response.cookies
+        assert (await client.get("/")).json() == {"primary": True}
+
+        client.cookies.clear()
+        assert (await client.get("/")).json() == {"primary": False}
+
+    await sessionmanager.close()
+
+
+@pytest.mark.anyio
+async def test_read_dependencies_share_one_replica(monkeypatch):
+    from app import db as db_module
+    from fastapi import Depends, FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL, replica_hosts=[DATABASE_TEST_URL, DATABASE_TEST_URL]
+    )
+    monkeypatch.setattr(db_module, "sessionmanager", sessionmanager)
+
+    app = FastAPI()
+
+    @app.get("/")
+    async def read(
+        db=Depends(db_module.get_read_db_session),
+        session_factory=Depends(db_module.get_read_db_session_factory),
+    ):
+        async with session_factory() as other:
+            return {"same": db.bind is other.bind}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(2):
+            assert (await client.get("/")).json() == {"same": True}
+
+    await sessionmanager.close()
+
+
+@pytest.mark.anyio
+async def test_summary_writes_set_primary_cookie(test_sessionmanager, monkeypatch):
+    from app import db as db_module
+    from app.main import create_application
+    from httpx import ASGITransport, AsyncClient
+
+    sessionmanager = DatabaseSessionManager(
+        DATABASE_TEST_URL, replica_hosts=[DATABASE_TEST_URL]
+    )
+    monkeypatch.setattr(db_module, "sessionmanager", sessionmanager)
+
+    transport = ASGITransport(app=create_application())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        url = "https://primary-cookie.test/"
+        response = await client.post("/summaries/", json={"url": url})
+        assert response.status_code == 201
+        assert db_module.PRIMARY_COOKIE in response.cookies
+        summary_id = response.json()["id"]
+
+        response = await client.post("/summaries/bulk/", json=[{"url": url + "2"}])
+        assert response.status_code == 201
+        assert db_module.PRIMARY_COOKIE in response.cookies
+        [bulk] = response.json()
+
+        response = await client.put(
+            f"/summaries/{summary_id}/", json={"url": url, "summary": "updated"}
+        )
+        assert response.status_code == 200
+        assert db_module.PRIMARY_COOKIE in response.cookies
+
+        for id in (summary_id, bulk["id"]):
+            response = await client.delete(f"/summaries/{id}/")
+            assert response.status_code == 200
+            assert db_module.PRIMARY_COOKIE in response.cookies
+
+    await sessionmanager.close()
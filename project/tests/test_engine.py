@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from app.engine import EngineBusyError, SummaryEngine
+from app.summarizer import SummarizerResourceError
+from prometheus_client import REGISTRY
+
+
+@pytest.mark.anyio
+async def test_engine_processes_jobs(monkeypatch, nltk_data):
+    engine = SummaryEngine(processes=1, concurrency=2, queue_size=10)
+    processed = []
+
+    async def mock_process(summary_id, url):
+        processed.append((summary_id, url))
+
+    monkeypatch.setattr(engine, "_process", mock_process)
+
+    await engine.start()
+    await engine.submit(1, "https://foo.bar/")
+    await engine.submit(2, "https://foo.baz/")
+    await engine.join()
+    await engine.stop()
+
+    assert sorted(processed) == [(1, "https://foo.bar/"), (2, "https://foo.baz/")]
+
+
+@pytest.mark.anyio
+async def test_engine_backpressure(monkeypatch, nltk_data):
+    engine = SummaryEngine(processes=1, concurrency=1, queue_size=1)
+    release = asyncio.Event()
+
+    async def mock_process(summary_id, url):
+        await release.wait()
+
+    monkeypatch.setattr(engine, "_process", mock_process)
+
+    await engine.start()
+    await engine.submit(1, "https://foo.bar/")
+    await asyncio.sleep(0)  # let the consumer pick up the first job
+    await engine.submit(2, "https://foo.bar/")
+    assert engine.saturated
+
+    with pytest.raises(EngineBusyError):
+        await engine.submit(3, "https://foo.bar/", timeout=0.01)
+
+    release.set()
+    await engine.join()
+    assert not engine.saturated
+    await engine.stop()
+
+
+@pytest.mark.anyio
+async def test_engine_job_timeout(monkeypatch, nltk_data):
+    engine = SummaryEngine(processes=1, concurrency=1, queue_size=1, job_timeout=0.01)
+    processed = []
+
+    async def mock_process(summary_id, url):
+        if summary_id == 1:
+            await asyncio.sleep(1)
+        processed.append(summary_id)
+
+    monkeypatch.setattr(engine, "_process", mock_process)
+
+    await engine.start()
+    first = await engine.submit(1, "https://foo.bar/")
+    second = await engine.submit(2, "https://foo.bar/")
+    await engine.join()
+    await engine.stop()
+
+    assert processed == [2]
+    with pytest.raises(asyncio.TimeoutError):
+        await first
+    assert await second is None
+
+
+@pytest.mark.anyio
+async def test_engine_warms_up_every_process(nltk_data):
+    engine = SummaryEngine(processes=2, concurrency=1)
+    await engine.start()
+    try:
+        pids = {process.pid for process in engine._executor._processes.values()}
+        assert len(pids) == 2
+    finally:
+        await engine.stop()
+
+    assert REGISTRY.get_sample_value(
+        "summarizer_startup_seconds", {"stage": "pool"}
+    ) > REGISTRY.get_sample_value(
+        "summarizer_startup_seconds", {"stage": "nlp_resources"}
+    )
+
+
+@pytest.mark.anyio
+async def test_engine_batch_size_one_skips_batcher(monkeypatch, nltk_data):
+    engine = SummaryEngine(processes=1, concurrency=1, batch_size=1)
+    await engine.start()
+    try:
+        assert engine._batcher is None
+    finally:
+        await engine.stop()
+
+
+@pytest.mark.anyio
+async def test_engine_start_fails_fast(monkeypatch):
+    engine = SummaryEngine(processes=1, concurrency=1)
+
+    async def warm_up():
+        raise SummarizerResourceError("punkt_tab is not installed")
+
+    monkeypatch.setattr(engine, "_warm_up", warm_up)
+
+    with pytest.raises(SummarizerResourceError):
+        await engine.start()
+    assert not engine.running
+    assert engine._executor is None
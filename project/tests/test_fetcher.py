@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import pytest
+from app.fetcher import ArticleFetcher, FetchError
+
+HTML = "<html><body><p>Café</p></body></html>"
+
+
+def handler(request):
+    path = request.url.path
+    if path == "/article":
+        return httpx.Response(200, html=HTML)
+    if path == "/latin1":
+        return httpx.Response(
+            200,
+            content=HTML.encode("latin-1"),
+            headers={"Content-Type": "text/html; charset=iso-8859-1"},
+        )
+    if path == "/pdf":
+        return httpx.Response(
+            200, content=b"%PDF", headers={"Content-Type": "application/pdf"}
+        )
+    if path == "/declared-large":
+        return httpx.Response(200, html=HTML, headers={"Content-Length": str(10**9)})
+    if path == "/large":
+
+        async def chunks():
+            for _ in range(100):
+                yield b"<p>" + b"x" * 1000
+
+        return httpx.Response(
+            200, content=chunks(), headers={"Content-Type": "text/html"}
+        )
+    if path == "/loop":
+        return httpx.Response(302, headers={"Location": "/loop"})
+    return httpx.Response(404)
+
+
+@pytest.fixture
+async def fetcher():
+    fetcher = ArticleFetcher(
+        max_bytes=10_000, max_redirects=3, transport=httpx.MockTransport(handler)
+    )
+    await fetcher.start()
+    yield fetcher
+    await fetcher.stop()
+
+
+@pytest.mark.anyio
+async def test_fetch_html(fetcher):
+    assert (await fetcher.fetch_page("https://foo.bar/article")).html == HTML
+    assert (await fetcher.fetch_page("https://foo.bar/latin1")).html == HTML
+
+
+@pytest.mark.anyio
+async def test_fetch_rejects_non_html(fetcher):
+    with pytest.raises(FetchError, match="not HTML"):
+        await fetcher.fetch_page("https://foo.bar/pdf")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/declared-large", "/large"])
+async def test_fetch_limits_body_size(fetcher, path):
+    with pytest.raises(FetchError, match="larger than"):
+        await fetcher.fetch_page(f"https://foo.bar{path}")
+
+
+@pytest.mark.anyio
+async def test_fetch_limits_redirects(fetcher):
+    with pytest.raises(httpx.TooManyRedirects):
+        await fetcher.fetch_page("https://foo.bar/loop")
+
+
+@pytest.mark.anyio
+async def test_fetch_raises_for_status(fetcher):
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetcher.fetch_page("https://foo.bar/missing")
+
+
+@pytest.mark.anyio
+async def test_per_host_limit():
+    active = {"foo.bar": 0, "foo.baz": 0}
+    peak = {"foo.bar": 0, "foo.baz": 0}
+
+    async def slow_handler(request):
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, html=HTML)
+
+    fetcher = ArticleFetcher(
+        per_host_limit=2, transport=httpx.MockTransport(slow_handler)
+    )
+    await fetcher.start()
+    await asyncio.gather(
+        *[fetcher.fetch_page(f"https://foo.bar/{i}") for i in range(6)],
+        *[fetcher.fetch_page(f"https://foo.baz/{i}") for i in range(6)],
+    )
+    await fetcher.stop()
+
+    assert peak == {"foo.bar": 2, "foo.baz": 2}
+    assert fetcher._hosts == {}
+
+
+@pytest.mark.anyio
+async def test_fetch_page_conditional():
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, html=HTML, headers={"ETag": '"v1"', "Last-Modified": "yesterday"}
+        )
+
+    fetcher = ArticleFetcher(transport=httpx.MockTransport(handler))
+    await fetcher.start()
+    try:
+        page = await fetcher.fetch_page("https://foo.bar/")
+        assert page == (HTML, '"v1"', "yesterday")
+
+        page = await fetcher.fetch_page("https://foo.bar/", page.etag, "yesterday")
+        assert page == (None, '"v1"', "yesterday")
+    finally:
+        await fetcher.stop()
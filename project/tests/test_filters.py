@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.api import crud
+from app.models.pydantic import SummaryFilterSchema
+from app.models.sqlalchemy import TextSummary
+from sqlalchemy import delete, insert, text
+
+
+@pytest.fixture
+async def db(db):
+    """A few summaries to filter."""
+    now = datetime.utcnow()
+    await db.execute(
+        insert(TextSummary).values(
+            [
+                {
+                    "url": "https://example.com/blog/1",
+                    "normalized_url": "https://example.com/blog/1",
+                    "summary": "Postgres indexes make searches fast",
+                    "created_at": now - timedelta(days=2),
+                    "updated_at": now,
+                },
+                {
+                    "url": "https://example.com/news/2",
+                    "normalized_url": "https://example.com/news/2",
+                    "summary": "",
+                    "created_at": now - timedelta(days=1),
+                    "updated_at": now,
+                },
+                {
+                    "url": "https://other.org/100%_pure",
+                    "normalized_url": "https://other.org/100%_pure",
+                    "summary": "Searching the web for fresh news",
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            ]
+        )
+    )
+    await db.commit()
+    return db
+
+
+async def urls(db, **filters):
+    rows = await crud.get_all_rows(db, filters=SummaryFilterSchema(**filters))
+    return [row["url"] for row in rows]
+
+
+@pytest.mark.anyio
+async def test_filters(db):
+    assert await urls(db, url_prefix="https://example.com/blog") == [
+        "https://example.com/blog/1"
+    ]
+    assert await urls(db, url_prefix="https://other.org/100%") == [
+        "https://other.org/100%_pure"
+    ]
+    assert await urls(db, url_prefix="https://other.org/1%") == []
+    assert await urls(db, domain="Example.com") == [
+        "https://example.com/blog/1",
+        "https://example.com/news/2",
+    ]
+    assert await urls(db, status="pending") == ["https://example.com/news/2"]
+    assert len(await urls(db, status="complete")) == 2
+
+    yesterday = datetime.utcnow() - timedelta(hours=36)
+    assert await urls(db, created_before=yesterday) == ["https://example.com/blog/1"]
+    assert len(await urls(db, created_after=yesterday)) == 2
+
+
+@pytest.mark.anyio
+async def test_search(db):
+    # Stemmed, so "searches" and "searching" both match "search"
+    assert len(await urls(db, q="search")) == 2
+    assert await urls(db, q="search -postgres") == ["https://other.org/100%_pure"]
+    assert await urls(db, q='"fresh news"') == ["https://other.org/100%_pure"]
+
+
+@pytest.mark.anyio
+async def test_sort_with_keyset_pagination(db):
+    newest_first = await urls(db, sort="-created_at")
+    assert newest_first == [
+        "https://other.org/100%_pure",
+        "https://example.com/news/2",
+        "https://example.com/blog/1",
+    ]
+
+    [first] = await crud.get_all_rows(
+        db, limit=1, filters=SummaryFilterSchema(sort="-created_at")
+    )
+    rest = await crud.get_all_rows(
+        db, after=first["id"], filters=SummaryFilterSchema(sort="-created_at")
+    )
+    assert [row["url"] for row in rest] == newest_first[1:]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("sort", ["created_at", "-created_at"])
+@pytest.mark.parametrize("page_size", [1, 2])
+async def test_keyset_pagination_after_deleted_row(db, sort, page_size):
+    expected = await urls(db, sort=sort)
+    filters = SummaryFilterSchema(sort=sort)
+
+    page = await crud.get_all_rows(db, limit=page_size, filters=filters)
+    # The last row of the page is deleted before the next page is read
+    await db.execute(delete(TextSummary).where(TextSummary.id == page[-1]["id"]))
+    await db.commit()
+    rest = await crud.get_all_rows(db, after=page[-1]["id"], filters=filters)
+
+    assert [row["url"] for row in rest] == expected[page_size:]
+
+
+async def explain(db, filters):
+    query = crud._all_query(None, SummaryFilterSchema(**filters)).limit(100)
+    compiled = query.compile(
+        dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    # The table is tiny, make the planner show whether the index can be used
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await db.execute(text(f"EXPLAIN {compiled}"))
+    plan = "\n".join(result.scalars())
+    await db.rollback()
+    return plan
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"url_prefix": "https://example.com/"}, "ix_text_summary_url_pattern"),
+        ({"domain": "example.com"}, "ix_text_summary_domain"),
+        ({"status": "pending"}, "ix_text_summary_pending"),
+        ({"q": "search"}, "ix_text_summary_summary_search"),
+        (
+            {"created_after": datetime(2020, 1, 1), "sort": "created_at"},
+            "ix_text_summary_created_at_id",
+        ),
+    ],
+)
+async def test_filters_use_indexes(db, filters, index):
+    assert index in await explain(db, filters)
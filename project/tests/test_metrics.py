@@ -0,0 +1,56 @@
+import pytest
+from app import metrics
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.anyio
+async def test_request_latency_by_route_template(test_app_with_db):
+    labels = {"method": "GET", "route": "/summaries/{id}/", "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    await test_app_with_db.get("/summaries/999999/")
+    await test_app_with_db.get("/summaries/999998/")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+@pytest.mark.anyio
+async def test_unmatched_routes_share_a_label(test_app_with_db):
+    labels = {"method": "GET", "route": metrics.UNMATCHED_ROUTE, "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    await test_app_with_db.get("/no/such/path")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 1
+
+
+@pytest.mark.anyio
+async def test_query_timing(test_app_with_db):
+    before = sample("db_query_duration_seconds_count", operation="SELECT")
+
+    await test_app_with_db.get("/summaries/")
+
+    assert sample("db_query_duration_seconds_count", operation="SELECT") > before
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(test_app_with_db):
+    await test_app_with_db.get("/ping")
+
+    response = await test_app_with_db.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/ping"' in response.text
+    assert "summary_queue_depth" in response.text
+
+
+def test_registry_merges_processes_in_multiprocess_mode(tmp_path, monkeypatch):
+    assert metrics.registry() is REGISTRY
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    assert metrics.registry() is not REGISTRY
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import json
+import os
+from datetime import datetime
+
+import pytest
+from app.api import crud
+from app.api.summaries import _summary_events, _wait_for_summary
+from app.models.pydantic import SummaryRecordSchema
+from app.notifications import CHANNEL, SummaryNotifier
+from sqlalchemy import func, select
+
+
+async def create_pending_summary(test_app_with_db, url):
+    response = await test_app_with_db.post("/summaries/", json={"url": url})
+    return response.json()["id"]
+
+
+async def complete_summary_later(test_app_with_db, summary_id, url, delay=0.2):
+    await asyncio.sleep(delay)
+    await test_app_with_db.put(
+        f"/summaries/{summary_id}/", json={"url": url, "summary": "done"}
+    )
+
+
+@pytest.mark.anyio
+async def test_long_poll_returns_when_summary_completes(test_app_with_db):
+    url = "https://foo.bar/long-poll"
+    summary_id = await create_pending_summary(test_app_with_db, url)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response, _ = await asyncio.gather(
+        test_app_with_db.get(f"/summaries/{summary_id}/", params={"wait": 10}),
+        complete_summary_later(test_app_with_db, summary_id, url),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "done"
+    assert loop.time() - started < 5
+
+
+@pytest.mark.anyio
+async def test_long_poll_times_out(test_app_with_db):
+    summary_id = await create_pending_summary(
+        test_app_with_db, "https://foo.bar/long-poll-timeout"
+    )
+
+    response = await test_app_with_db.get(
+        f"/summaries/{summary_id}/", params={"wait": 1}
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"] == ""
+
+
+@pytest.mark.anyio
+async def test_events_stream_completion(test_app_with_db):
+    url = "https://foo.bar/events"
+    summary_id = await create_pending_summary(test_app_with_db, url)
+
+    response, _ = await asyncio.gather(
+        test_app_with_db.get(f"/summaries/{summary_id}/events/"),
+        complete_summary_later(test_app_with_db, summary_id, url),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    event, data = response.text.strip().split("\n")
+    assert event == "event: completed"
+    assert json.loads(data.removeprefix("data: "))["summary"] == "done"
+
+
+@pytest.mark.anyio
+async def test_events_stream_deletion(test_app_with_db):
+    summary_id = await create_pending_summary(
+        test_app_with_db, "https://foo.bar/events-deleted"
+    )
+
+    async def delete_later():
+        await asyncio.sleep(0.2)
+        await test_app_with_db.delete(f"/summaries/{summary_id}/")
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response, _ = await asyncio.gather(
+        test_app_with_db.get(f"/summaries/{summary_id}/events/"), delete_later()
+    )
+
+    # Notified by the DELETE, not noticed at the next keepalive re-read
+    assert response.text.startswith("event: deleted")
+    assert loop.time() - started < 5
+
+
+@pytest.mark.anyio
+async def test_events_already_completed(test_app_with_db):
+    url = "https://foo.bar/events-done"
+    summary_id = await create_pending_summary(test_app_with_db, url)
+    await complete_summary_later(test_app_with_db, summary_id, url, delay=0)
+
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/events/")
+    assert response.text.startswith("event: completed\n")
+
+
+@pytest.mark.anyio
+async def test_events_incorrect_id(test_app_with_db):
+    response = await test_app_with_db.get("/summaries/999999/events/")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Summary not found"
+
+
+@pytest.mark.anyio
+async def test_notifier_fans_out(test_sessionmanager):
+    notifier = SummaryNotifier(os.environ.get("DATABASE_TEST_URL"))
+
+    async with notifier.subscribe(1) as first, notifier.subscribe(1) as second:
+        async with notifier.subscribe(2) as other:
+            assert notifier.waiting == 3
+
+            async with test_sessionmanager.session() as db:
+                await db.execute(select(func.pg_notify(CHANNEL, "1")))
+                await db.commit()
+
+            await asyncio.wait_for(first.wait(), 5)
+            await asyncio.wait_for(second.wait(), 5)
+            assert not other.is_set()
+
+    assert notifier.waiting == 0
+    await notifier.stop()
+
+
+class NotifiedSoon:
+    """A notifier whose subscriptions are notified shortly after subscribing."""
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, summary_id):
+        event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.01, event.set)
+        yield event
+
+
+def lagging_replica(monkeypatch):
+    """
+    Session factories for a replica that still has the summary pending and a
+    primary that has it done, with crud.get_cached reading from them.
+    """
+    pending = SummaryRecordSchema(
+        id=1, url="https://foo.bar/", summary="", created_at=datetime.utcnow()
+    )
+    done = pending.model_copy(update={"summary": "done"})
+
+    async def get_cached(id, db):
+        return done if db == "primary" else pending
+
+    def factory(name):
+        @contextlib.asynccontextmanager
+        async def session():
+            yield name
+
+        return session
+
+    monkeypatch.setattr(crud, "get_cached", get_cached)
+    return factory("replica"), factory("primary")
+
+
+@pytest.mark.anyio
+async def test_long_poll_rereads_from_primary(monkeypatch):
+    replica, primary = lagging_replica(monkeypatch)
+
+    class Replica:
+        async def close(self):
+            pass
+
+        def __eq__(self, other):
+            return other == "replica"
+
+    summary = await _wait_for_summary(1, 1, Replica(), primary, NotifiedSoon())
+    assert summary.summary == "done"
+
+
+@pytest.mark.anyio
+async def test_events_reread_from_primary(monkeypatch):
+    replica, primary = lagging_replica(monkeypatch)
+    events = _summary_events(1, replica, primary, NotifiedSoon(), 60, 60)
+
+    assert (await anext(events)).startswith("event: completed")
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+from app import profiling
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+
+def profiled_app(**kwargs):
+    app = FastAPI()
+
+    @app.get("/work/{n}")
+    async def work(n: int):
+        return {"total": sum(range(n))}
+
+    app.add_middleware(profiling.ProfilingMiddleware, **kwargs)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_profile_triggered_by_header(tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="app.profiling")
+
+    async with profiled_app(token="secret", directory=str(tmp_path)) as client:
+        response = await client.get("/work/1000", headers={"X-Profile": "secret"})
+        profile_id = response.headers["x-profile-id"]
+        assert response.json() == {"total": 499500}
+        assert (tmp_path / f"{profile_id}.prof").exists()
+        assert f"Profile {profile_id} of GET /work/{{n}}" in caplog.text
+
+        response = await client.get("/work/1000", headers={"X-Profile": "guess"})
+        assert "x-profile-id" not in response.headers
+        response = await client.get("/work/1000")
+        assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_profile_sampling(tmp_path):
+    async with profiled_app(sample_rate=1.0) as client:
+        response = await client.get("/work/10")
+        assert "x-profile-id" in response.headers
+
+
+@pytest.mark.anyio
+async def test_slow_query_log(test_app_with_db, caplog):
+    profiling.log_slow_queries(0.0)
+    try:
+        await test_app_with_db.get("/summaries/999999/")
+    finally:
+        profiling.log_slow_queries(None)
+
+    [record] = [r for r in caplog.records if r.msg.startswith("Slow query")]
+    message = record.getMessage()
+    assert "from GET /summaries/{id}/" in message
+    assert "FROM text_summary" in message
+    assert "999999" not in message
+
+    caplog.clear()
+    await test_app_with_db.get("/summaries/999999/")
+    assert "Slow query" not in caplog.text
+
+
+def test_fingerprint():
+    assert profiling.fingerprint((1, "a")) == profiling.fingerprint((1, "a"))
+    assert profiling.fingerprint((1, "a")) != profiling.fingerprint((2, "a"))
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from app import summarizer
+from app.models.sqlalchemy import TextSummary
+from app.result_writer import ResultWriter
+from sqlalchemy import select
+
+
+@pytest.fixture
+async def summaries(summarizer_sessionmanager):
+    async with summarizer_sessionmanager.session() as db:
+        rows = [TextSummary(url=f"https://foo.bar/{i}", summary="") for i in range(4)]
+        db.add_all(rows)
+        await db.commit()
+        yield [row.id for row in rows]
+
+
+async def saved(test_sessionmanager, ids):
+    async with test_sessionmanager.session() as db:
+        result = await db.execute(
+            select(TextSummary.summary)
+            .where(TextSummary.id.in_(ids))
+            .order_by(TextSummary.id)
+        )
+        return result.scalars().all()
+
+
+@pytest.mark.anyio
+async def test_flushes_full_batch_in_one_statement(
+    summaries, test_sessionmanager, query_counter
+):
+    writer = ResultWriter(batch_size=4, flush_interval=60)
+    await writer.start()
+    await asyncio.wait_for(
+        asyncio.gather(
+            writer.write([(summaries[0], "a")]),
+            writer.write([(summaries[1], "b"), (summaries[2], "c")]),
+            writer.write([(summaries[3], "d")]),
+        ),
+        1,
+    )
+    await writer.stop()
+
+    updates = [s for s in query_counter if s.lstrip().startswith("UPDATE")]
+    assert len(updates) == 1
+    assert await saved(test_sessionmanager, summaries) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.anyio
+async def test_flushes_every_interval(summaries, test_sessionmanager):
+    writer = ResultWriter(batch_size=100, flush_interval=0.01)
+    await writer.start()
+    await asyncio.wait_for(writer.write([(summaries[0], "a")]), 1)
+    await writer.stop()
+
+    assert await saved(test_sessionmanager, summaries[:1]) == ["a"]
+
+
+@pytest.mark.anyio
+async def test_stop_flushes(summaries, test_sessionmanager):
+    writer = ResultWriter(batch_size=100, flush_interval=60)
+    await writer.start()
+    write = asyncio.create_task(writer.write([(summaries[0], "a")]))
+    await asyncio.sleep(0)
+
+    await writer.stop()
+
+    assert write.done() and write.exception() is None
+    assert await saved(test_sessionmanager, summaries[:1]) == ["a"]
+
+
+@pytest.mark.anyio
+async def test_failed_flush_fails_every_write(monkeypatch):
+    async def save_summaries(summaries):
+        raise ValueError("database is down")
+
+    monkeypatch.setattr(summarizer, "save_summaries", save_summaries)
+    writer = ResultWriter(batch_size=2, flush_interval=60)
+    await writer.start()
+    results = await asyncio.gather(
+        writer.write([(1, "a")]), writer.write([(2, "b")]), return_exceptions=True
+    )
+    await writer.stop()
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only by the summarizer processes, see app/summarizer.py
+SUMMARIZER_MODULES = ("newspaper", "nltk", "lxml", "PIL", "numpy")
+
+# Cold import of the API on a dev machine takes about 1s
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def cold_import(module: str) -> dict:
+    """Import `module` in a fresh interpreter, returning its time and modules."""
+    code = f"""
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "modules": [name for name in sys.modules if "." not in name],
+}}))
+"""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.worker"])
+def test_does_not_import_summarizer_stack(module):
+    imported = cold_import(module)["modules"]
+    assert [name for name in SUMMARIZER_MODULES if name in imported] == []
+
+
+def test_api_import_budget():
+    assert cold_import("app.main")["seconds"] < IMPORT_BUDGET_SECONDS
@@ -1,15 +1,6 @@
 import json
 
 import pytest
-from app.api import summaries
-
-
-@pytest.fixture(autouse=True)
-def mock_generate_summary_fixture(monkeypatch):
-    def mock_generate_summary(summary_id, url):
-        return None
-
-    monkeypatch.setattr(summaries, "generate_summary", mock_generate_summary)
 
 
 @pytest.mark.anyio
@@ -227,3 +218,292 @@ async def test_update_summary_invalid_url(test_app_with_db):
     assert (
         response.json()["detail"][0]["msg"] == "URL scheme should be 'http' or 'https'"
     )
+
+
+@pytest.mark.anyio
+async def test_read_all_summaries_paginated(test_app_with_db):
+    ids = []
+    for i in range(3):
+        response = await test_app_with_db.post(
+            "/summaries/", data=json.dumps({"url": f"https://foo.bar/page/{i}"})
+        )
+        ids.append(response.json()["id"])
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={"limit": 2, "after": ids[0] - 1}
+    )
+    assert response.status_code == 200
+    assert [d["id"] for d in response.json()] == ids[:2]
+    assert 'rel="next"' in response.headers["link"]
+    assert f"after={ids[1]}" in response.headers["link"]
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={"limit": 2, "after": ids[1]}
+    )
+    assert [d["id"] for d in response.json()] == ids[2:]
+    assert "link" not in response.headers
+
+    response = await test_app_with_db.get("/summaries/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_read_all_summaries_stream(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/", data=json.dumps({"url": "https://foo.bar/stream"})
+    )
+    summary_id = response.json()["id"]
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={"stream": True, "after": summary_id - 1}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["id"] == summary_id
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={"stream": True, "limit": 1}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "limit"]
+
+
+@pytest.mark.anyio
+async def test_create_summaries_bulk(test_app_with_db):
+    urls = [f"https://foo.bar/{i}" for i in range(5)]
+    response = await test_app_with_db.post(
+        "/summaries/bulk/", json=[{"url": url} for url in urls]
+    )
+    assert response.status_code == 201
+
+    response_list = response.json()
+    assert [d["url"] for d in response_list] == urls
+    ids = [d["id"] for d in response_list]
+    assert ids == sorted(ids)
+
+    for summary_id, url in zip(ids, urls):
+        response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+        assert response.json()["url"] == url
+
+
+@pytest.mark.anyio
+async def test_create_summaries_bulk_ndjson(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/bulk/",
+        content=b'{"url": "https://foo.bar/a"}\n{"url": "https://foo.bar/b"}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    assert [d["url"] for d in response.json()] == [
+        "https://foo.bar/a",
+        "https://foo.bar/b",
+    ]
+
+
+@pytest.mark.anyio
+async def test_create_summaries_bulk_ndjson_invalid_lines(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/bulk/",
+        content=(
+            b'{"url": "https://foo.bar/a"}\n'
+            b'{"url": "https://foo.bar/b"},{"url": "https://foo.bar/c"}\n'
+            b"  \n"
+            b'{"url": "invalid://url"}\n'
+        ),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 422
+    assert [(e["loc"], e["type"]) for e in response.json()["detail"]] == [
+        (["body", 2], "json_invalid"),
+        (["body", 3], "json_invalid"),
+        (["body", 4, "url"], "url_scheme"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_create_summaries_bulk_invalid(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/bulk/", json=[{"url": "https://foo.bar/"}, {"url": "invalid://url"}]
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "url"]
+
+    response = await test_app_with_db.post("/summaries/bulk/", json=[])
+    assert response.status_code == 201
+    assert response.json() == []
+
+
+@pytest.mark.anyio
+async def test_create_summary_existing_url(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://foo.bar/dedup"}
+    )
+    summary_id = response.json()["id"]
+
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://FOO.bar/dedup/?utm_source=feed"}
+    )
+    assert response.status_code == 201
+    assert response.json()["id"] == summary_id
+
+    response = await test_app_with_db.post(
+        "/summaries/", params={"refresh": True}, json={"url": "https://foo.bar/dedup"}
+    )
+    assert response.json()["id"] == summary_id
+
+
+@pytest.mark.anyio
+async def test_update_summary_conflicting_url(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/bulk/",
+        json=[{"url": "https://foo.bar/one"}, {"url": "https://foo.bar/two"}],
+    )
+    first_id, _ = [d["id"] for d in response.json()]
+
+    response = await test_app_with_db.put(
+        f"/summaries/{first_id}/",
+        json={"url": "https://foo.bar/two/", "summary": "updated!"},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "A summary for this URL already exists"
+
+
+@pytest.mark.anyio
+async def test_read_summary_conditional(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://foo.bar/etag"}
+    )
+    summary_id = response.json()["id"]
+
+    response = await test_app_with_db.get(f"/summaries/{summary_id}/")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    assert etag.startswith(f'"{summary_id}-')
+
+    response = await test_app_with_db.get(
+        f"/summaries/{summary_id}/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = await test_app_with_db.get(
+        f"/summaries/{summary_id}/", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    await test_app_with_db.put(
+        f"/summaries/{summary_id}/",
+        json={"url": "https://foo.bar/etag", "summary": "done"},
+    )
+    response = await test_app_with_db.get(
+        f"/summaries/{summary_id}/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"] == "done"
+    assert response.headers["etag"] != etag
+
+    response = await test_app_with_db.get(
+        "/summaries/999999/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_read_all_summaries_conditional(test_app_with_db):
+    response = await test_app_with_db.get("/summaries/")
+    etag = response.headers["etag"]
+
+    response = await test_app_with_db.get(
+        "/summaries/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    await test_app_with_db.post("/summaries/", json={"url": "https://foo.bar/new"})
+    response = await test_app_with_db.get(
+        "/summaries/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.anyio
+async def test_writes_are_single_statements(test_app_with_db, query_counter):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://round-trips.test/"}
+    )
+    summary_id = response.json()["id"]
+    assert len(query_counter) == 1
+
+    query_counter.clear()
+    response = await test_app_with_db.put(
+        f"/summaries/{summary_id}/",
+        json={"url": "https://round-trips.test/", "summary": "updated"},
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"] == "updated"
+    assert len(query_counter) == 1
+
+    query_counter.clear()
+    response = await test_app_with_db.delete(f"/summaries/{summary_id}/")
+    assert response.json() == {"id": summary_id, "url": "https://round-trips.test/"}
+    assert len(query_counter) == 1
+
+    query_counter.clear()
+    response = await test_app_with_db.delete(f"/summaries/{summary_id}/")
+    assert response.status_code == 404
+    assert len(query_counter) == 1
+
+
+@pytest.mark.anyio
+async def test_read_all_summaries_fields(test_app_with_db, query_counter):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://foo.bar/fields"}
+    )
+    summary_id = response.json()["id"]
+    params = {"after": summary_id - 1}
+
+    query_counter.clear()
+    response = await test_app_with_db.get("/summaries/", params=params)
+    [summary] = response.json()
+    assert set(summary) == {"id", "url", "created_at", "status"}
+    assert summary["status"] == "pending"
+    assert "text_summary.summary," not in query_counter[0]
+    default_etag = response.headers["etag"]
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={**params, "fields": "id,summary"}
+    )
+    assert response.json() == [{"id": summary_id, "summary": ""}]
+    assert response.headers["etag"] != default_etag
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={**params, "fields": "url", "stream": True}
+    )
+    assert json.loads(response.text) == {"url": "https://foo.bar/fields"}
+
+    response = await test_app_with_db.get(
+        "/summaries/", params={**params, "fields": "id,password"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "fields", 1]
+
+
+@pytest.mark.anyio
+async def test_read_all_summaries_filtered(test_app_with_db):
+    response = await test_app_with_db.post(
+        "/summaries/", json={"url": "https://filtered.example/a"}
+    )
+    summary_id = response.json()["id"]
+
+    response = await test_app_with_db.get(
+        "/summaries/",
+        params={"domain": "filtered.example", "status": "pending", "sort": "-id"},
+    )
+    assert [d["id"] for d in response.json()] == [summary_id]
+
+    response = await test_app_with_db.get("/summaries/", params={"sort": "summary"})
+    assert response.status_code == 422
@@ -2,14 +2,11 @@ import json
 from datetime import datetime
 
 import pytest
-from app.api import crud, summaries
-
-
-@pytest.fixture(autouse=True)
-def mock_generate_summary_fixture(monkeypatch):
-    def mock_generate_summary(summary_id, url):
-        return None
-    monkeypatch.setattr(summaries, "generate_summary", mock_generate_summary)
+from app.api import crud
+from app.main import default_response_class
+from app.models.pydantic import SummarySchema
+from app.models.sqlalchemy import TextSummary
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 
 @pytest.mark.anyio
@@ -17,7 +14,7 @@ async def test_create_summary(test_app_with_db, monkeypatch):
     test_request_payload = {"url": "https://foo.bar"}
     test_response_payload = {"id": 1, "url": "https://foo.bar/"}
 
-    async def mock_post(payload, db):
+    async def mock_post(payload, db, refresh=False, ttl=None):
         return 1
 
     monkeypatch.setattr(crud, "post", mock_post)
@@ -64,10 +61,10 @@ async def test_read_summary(test_app_with_db, monkeypatch):
         "created_at": datetime.utcnow().isoformat(),
     }
 
-    async def mock_get(id, db):
+    async def mock_get_row(id, db):
         return test_data
 
-    monkeypatch.setattr(crud, "get", mock_get)
+    monkeypatch.setattr(crud, "get_row", mock_get_row)
 
     response = await test_app_with_db.get("/summaries/1/")
     assert response.status_code == 200
@@ -76,36 +73,38 @@ async def test_read_summary(test_app_with_db, monkeypatch):
 
 @pytest.mark.anyio
 async def test_read_summary_incorrect_id(test_app_with_db, monkeypatch):
-    async def mock_get(id, db):
+    async def mock_get_row(id, db):
         return None
 
-    monkeypatch.setattr(crud, "get", mock_get)
+    monkeypatch.setattr(crud, "get_row", mock_get_row)
 
     response = await test_app_with_db.get("/summaries/999/")
     assert response.status_code == 404
     assert response.json()["detail"] == "Summary not found"
 
 
+@pytest.mark.anyio
 async def test_read_all_summaries(test_app_with_db, monkeypatch):
     test_data = [
         {
             "id": 1,
             "url": "https://foo.bar",
-            "summary": "summary",
             "created_at": datetime.utcnow().isoformat(),
+            "status": "complete",
         },
         {
             "id": 2,
             "url": "https://testdrivenn.io",
-            "summary": "summary",
             "created_at": datetime.utcnow().isoformat(),
+            "status": "pending",
         },
     ]
 
-    async def mock_get_all():
-        return test_data
+    async def mock_get_all_rows(db, limit=None, after=None, fields=None, filters=None):
+        assert fields == list(crud.DEFAULT_LIST_FIELDS)
+        return [{**row, "updated_at": datetime.utcnow()} for row in test_data]
 
-    monkeypatch.setattr(crud, "get_all", mock_get_all)
+    monkeypatch.setattr(crud, "get_all_rows", mock_get_all_rows)
 
     response = await test_app_with_db.get("/summaries/")
     assert response.status_code == 200
@@ -114,18 +113,8 @@ async def test_read_all_summaries(test_app_with_db, monkeypatch):
 
 @pytest.mark.anyio
 async def test_remove_summary(test_app_with_db, monkeypatch):
-    async def mock_get(id, db):
-        return {
-            "id": 1,
-            "url": "https://foo.bar",
-            "summary": "summary",
-            "created_at": datetime.utcnow().isoformat(),
-        }
-
-    monkeypatch.setattr(crud, "get", mock_get)
-
     async def mock_delete(id, db):
-        return id
+        return {"id": 1, "url": "https://foo.bar"}
 
     monkeypatch.setattr(crud, "delete", mock_delete)
 
@@ -136,10 +125,10 @@ async def test_remove_summary(test_app_with_db, monkeypatch):
 
 @pytest.mark.anyio
 async def test_remove_summary_incorrect_id(test_app_with_db, monkeypatch):
-    async def mock_get(id, db):
+    async def mock_delete(id, db):
         return None
 
-    monkeypatch.setattr(crud, "get", mock_get)
+    monkeypatch.setattr(crud, "delete", mock_delete)
 
     response = await test_app_with_db.delete("/summaries/999/")
     assert response.status_code == 404
@@ -239,3 +228,24 @@ async def test_update_summary_invalid(
     )
     assert response.status_code == status_code
     assert response.json()["detail"] == detail
+
+
+def test_summary_schema_from_orm():
+    created_at = datetime.utcnow()
+    summary = TextSummary(
+        id=1, url="https://foo.bar", summary="s", created_at=created_at
+    )
+
+    assert SummarySchema.model_validate(summary).model_dump() == {
+        "id": 1,
+        "url": "https://foo.bar",
+        "summary": "s",
+        "created_at": created_at,
+    }
+
+
+def test_default_response_class():
+    assert default_response_class("json") is JSONResponse
+    assert default_response_class("orjson") is ORJSONResponse
+    with pytest.raises(ValueError, match="Unknown JSON response"):
+        default_response_class("ujson")
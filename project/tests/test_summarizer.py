@@ -0,0 +1,133 @@
+import os
+import random
+
+import nltk
+import pytest
+from app import summarizer
+from app.summarizer_backends import (
+    NewspaperSummarizer,
+    NumpySummarizer,
+    POSITION_BOUNDS,
+    POSITION_SCORES,
+    create_backend,
+    split_words,
+)
+from newspaper import nlp
+
+TEXT = (
+    "The first sentence of the article is about caching. "
+    "The second sentence talks about something else entirely. "
+    "The third sentence mentions caching once more."
+)
+
+
+@pytest.fixture
+def cold(monkeypatch):
+    """Forget what warm_up() loaded, restoring it afterwards."""
+    monkeypatch.setattr(summarizer, "_config", None)
+    monkeypatch.setattr(summarizer, "_tokenizer", None)
+    monkeypatch.setattr(summarizer, "_backend", None)
+    monkeypatch.setattr(nlp, "split_sentences", nlp.split_sentences)
+
+
+def test_warm_up_fails_without_nltk_data(cold, tmp_path, monkeypatch):
+    monkeypatch.setattr(nltk.data, "path", [str(tmp_path)])
+
+    with pytest.raises(summarizer.SummarizerResourceError, match="punkt_tab"):
+        summarizer.warm_up()
+
+
+def test_warm_up_loads_once(cold, nltk_data):
+    seconds = summarizer.warm_up()
+    tokenizer = summarizer._tokenizer
+
+    assert seconds > 0
+    assert summarizer.warm_up() == seconds
+    assert summarizer._tokenizer is tokenizer
+    assert nlp.split_sentences is summarizer._split_sentences
+
+
+def test_summarize_text(cold, nltk_data):
+    summary = summarizer.summarize_text("Caching", TEXT)
+
+    assert "The first sentence of the article is about caching." in summary
+    assert summarizer._tokenizer is not None
+
+
+@pytest.fixture
+def warm(cold, nltk_data):
+    summarizer.warm_up()
+
+
+def random_article(rng: random.Random):
+    words = "The tram city council budget plan of and a new line Çà x.y 3.5 e-mail"
+    words = words.split()
+    sentences = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(0, 30))) + "."
+        for _ in range(rng.randint(1, 40))
+    ]
+    title = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+    return title, rng.choice([" ", "\n"]).join(sentences)
+
+
+def test_split_words():
+    for text in ("Hello, World... e-mail 3.5 x.y", "Çà\nİstanbul  _a_", ""):
+        assert split_words(text) == nlp.split_words(text)
+
+
+def test_position_scores():
+    for size in range(1, 60):
+        for i in range(1, size + 1):
+            index = POSITION_BOUNDS.searchsorted(i / size)
+            assert POSITION_SCORES[index] == nlp.sentence_position(i, size)
+
+
+def test_numpy_backend_matches_newspaper(warm):
+    newspaper, numpy = NewspaperSummarizer(), NumpySummarizer()
+    rng = random.Random(0)
+    for _ in range(200):
+        title, text = random_article(rng)
+        assert numpy.summarize(title, text, 5) == newspaper.summarize(title, text, 5)
+
+
+def test_numpy_backend_batches(warm):
+    newspaper, numpy = NewspaperSummarizer(), NumpySummarizer(max_vocabulary=50)
+    rng = random.Random(1)
+    for _ in range(50):
+        articles = [random_article(rng) for _ in range(rng.randint(1, 8))]
+        articles.append(("", "An article without a title, never summarized."))
+        expected = [newspaper.summarize(title, text, 3) for title, text in articles]
+        assert numpy.summarize_many(articles, 3) == expected
+
+
+def test_summarize_batch(cold, nltk_data):
+    articles = [("Caching", TEXT), ("Something", TEXT)]
+
+    assert summarizer.summarize_batch(articles) == [
+        summarizer.summarize_text(title, text) for title, text in articles
+    ]
+
+
+def test_numpy_backend_fixture_article(warm):
+    fixture = os.path.join(
+        os.path.dirname(__file__), "..", "benchmarks", "fixtures", "article.html"
+    )
+    with open(fixture) as f:
+        title, text = summarizer.extract_article("https://foo.bar/", f.read())
+
+    summary = NumpySummarizer().summarize(title, text, 5)
+    assert len(summary) == 5
+    assert summary == NewspaperSummarizer().summarize(title, text, 5)
+
+
+def test_backend_from_settings(cold, nltk_data, monkeypatch):
+    monkeypatch.setattr(summarizer.settings, "summarizer_backend", "numpy")
+    summary = summarizer.summarize_text("Caching", TEXT)
+
+    assert isinstance(summarizer._backend, NumpySummarizer)
+    assert "The first sentence of the article is about caching." in summary
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown summarizer backend"):
+        create_backend("gpt")
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.api import crud
+from app.models.pydantic import SummaryPayloadSchema
+from app.models.sqlalchemy import SummaryJob, TextSummary
+from app.urls import normalize_url
+from sqlalchemy import delete, func, select, update
+
+
+@pytest.mark.parametrize(
+    "url, normalized",
+    [
+        ["https://foo.bar", "https://foo.bar/"],
+        ["HTTPS://Foo.Bar/", "https://foo.bar/"],
+        ["https://foo.bar:443/a/", "https://foo.bar/a"],
+        ["http://foo.bar:8080/a", "http://foo.bar:8080/a"],
+        ["https://foo.bar/a#section", "https://foo.bar/a"],
+        ["https://foo.bar/a?b=2&a=1", "https://foo.bar/a?a=1&b=2"],
+        [
+            "https://foo.bar/a?utm_source=x&UTM_Medium=y&fbclid=z&id=1",
+            "https://foo.bar/a?id=1",
+        ],
+    ],
+)
+def test_normalize_url(url, normalized):
+    assert normalize_url(url) == normalized
+
+
+async def count_jobs(db):
+    result = await db.execute(select(func.count()).select_from(SummaryJob))
+    return result.scalar()
+
+
+@pytest.mark.anyio
+async def test_post_reuses_existing_summary(db):
+    first = await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db)
+    second = await crud.post(
+        SummaryPayloadSchema(url="HTTPS://FOO.BAR/a/?utm_source=feed"), db
+    )
+
+    assert first == second
+    assert await count_jobs(db) == 1
+
+    summary = await crud.get(first, db)
+    assert summary.url == "https://foo.bar/a"
+    assert summary.normalized_url == "https://foo.bar/a"
+
+
+@pytest.mark.anyio
+async def test_post_bulk_deduplicates(db):
+    existing = await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db)
+    ids = await crud.post_bulk(
+        [
+            SummaryPayloadSchema(url="https://foo.bar/b"),
+            SummaryPayloadSchema(url="https://foo.bar/a"),
+            SummaryPayloadSchema(url="https://foo.bar/b/"),
+        ],
+        db,
+    )
+
+    assert ids[1] == existing
+    assert ids[0] == ids[2] != existing
+    assert await count_jobs(db) == 2
+
+
+@pytest.mark.anyio
+async def test_post_refresh(db):
+    summary_id = await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db)
+    await db.execute(delete(SummaryJob))
+    await db.commit()
+
+    assert await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db) == (
+        summary_id
+    )
+    assert await count_jobs(db) == 0
+
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db, refresh=True)
+    assert await count_jobs(db) == 1
+
+
+@pytest.mark.anyio
+async def test_post_ttl(db):
+    summary_id = await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db)
+    await db.execute(delete(SummaryJob))
+    await db.execute(
+        update(TextSummary)
+        .where(TextSummary.id == summary_id)
+        .values(summary="done", summarized_at=datetime.utcnow() - timedelta(hours=2))
+    )
+    await db.commit()
+
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db, ttl=86400)
+    assert await count_jobs(db) == 0
+
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/a"), db, ttl=3600)
+    assert await count_jobs(db) == 1
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from app import jobs
+from app.api import crud
+from app.engine import SummaryEngine
+from app.models.pydantic import SummaryPayloadSchema
+from app.models.sqlalchemy import SummaryJob
+from app.worker import Worker
+from prometheus_client import REGISTRY
+from sqlalchemy import func, select, update
+
+
+def make_worker(test_sessionmanager, monkeypatch, process, **kwargs):
+    engine = SummaryEngine(processes=1, concurrency=2, queue_size=10)
+
+    async def warm_up():
+        pass
+
+    monkeypatch.setattr(engine, "_warm_up", warm_up)
+    monkeypatch.setattr(engine, "_process", process)
+    return Worker(test_sessionmanager, engine, poll_interval=0.01, **kwargs)
+
+
+async def run_until_idle(worker):
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0.2)
+    worker.stop()
+    await task
+
+
+@pytest.mark.anyio
+async def test_post_enqueues_job(db):
+    summary_id = await crud.post(SummaryPayloadSchema(url="https://foo.bar/"), db)
+
+    job = (
+        await db.execute(select(SummaryJob).where(SummaryJob.summary_id == summary_id))
+    ).scalar_one()
+    assert job.status == jobs.PENDING
+    assert job.url == "https://foo.bar/"
+    assert job.attempts == 0
+
+
+@pytest.mark.anyio
+async def test_claim_skips_locked_jobs(db, test_sessionmanager):
+    for i in range(4):
+        await crud.post(SummaryPayloadSchema(url=f"https://foo.bar/{i}"), db)
+
+    async def claim():
+        async with test_sessionmanager.session() as session:
+            return await jobs.claim(2, 60, 5, session)
+
+    first, second = await asyncio.gather(claim(), claim())
+    claimed = [job.id for job in first + second]
+    assert len(claimed) == 4
+    assert len(set(claimed)) == 4
+    assert all(job.status == jobs.RUNNING and job.attempts == 1 for job in first)
+
+    async with test_sessionmanager.session() as session:
+        assert await jobs.claim(2, 60, 5, session) == []
+
+
+@pytest.mark.anyio
+async def test_claim_reclaims_expired_lease(db, test_sessionmanager):
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/"), db)
+    [job] = await jobs.claim(1, 60, 5, db)
+
+    await db.execute(
+        update(SummaryJob)
+        .where(SummaryJob.id == job.id)
+        .values(lease_expires_at=func.now())
+    )
+    await db.commit()
+
+    [reclaimed] = await jobs.claim(1, 60, 5, db)
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+
+@pytest.mark.anyio
+async def test_claim_fails_expired_lease_without_attempts_left(db):
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/"), db)
+    [job] = await jobs.claim(1, 60, 1, db)
+
+    await db.execute(
+        update(SummaryJob)
+        .where(SummaryJob.id == job.id)
+        .values(lease_expires_at=func.now())
+    )
+    await db.commit()
+
+    assert await jobs.claim(1, 60, 1, db) == []
+    await db.refresh(job)
+    assert job.status == jobs.FAILED
+    assert job.lease_expires_at is None
+    assert job.last_error == "Lease expired"
+
+
+@pytest.mark.anyio
+async def test_worker_completes_jobs(db, test_sessionmanager, monkeypatch):
+    processed = []
+
+    async def mock_process(summary_id, url):
+        processed.append(summary_id)
+
+    def completed():
+        labels = {"outcome": "success"}
+        return REGISTRY.get_sample_value("summary_job_duration_seconds_count", labels)
+
+    summary_id = await crud.post(SummaryPayloadSchema(url="https://foo.bar/"), db)
+    before = completed() or 0
+    worker = make_worker(test_sessionmanager, monkeypatch, mock_process)
+    await run_until_idle(worker)
+
+    assert processed == [summary_id]
+    assert completed() == before + 1
+    remaining = await db.execute(select(func.count()).select_from(SummaryJob))
+    assert remaining.scalar() == 0
+
+
+@pytest.mark.anyio
+async def test_worker_retries_with_backoff(db, test_sessionmanager, monkeypatch):
+    async def mock_process(summary_id, url):
+        raise ValueError("boom")
+
+    await crud.post(SummaryPayloadSchema(url="https://foo.bar/"), db)
+    worker = make_worker(
+        test_sessionmanager, monkeypatch, mock_process, max_attempts=2, backoff_base=60
+    )
+    await run_until_idle(worker)
+
+    job = (await db.execute(select(SummaryJob))).scalar_one()
+    await db.refresh(job)
+    assert job.status == jobs.PENDING
+    assert job.attempts == 1
+    assert "boom" in job.last_error
+    assert job.run_at > (await db.execute(select(func.now()))).scalar()
+
+    await db.execute(update(SummaryJob).values(run_at=func.now()))
+    await db.commit()
+    worker = make_worker(
+        test_sessionmanager, monkeypatch, mock_process, max_attempts=2, backoff_base=60
+    )
+    await run_until_idle(worker)
+
+    await db.refresh(job)
+    assert job.status == jobs.FAILED
+    assert job.attempts == 2
+
+
+def test_backoff():
+    assert jobs.backoff(1, 10, 3600) == 10
+    assert jobs.backoff(3, 10, 3600) == 40
+    assert jobs.backoff(20, 10, 3600) == 3600